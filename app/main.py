@@ -5,6 +5,7 @@ I-TUTOR Main Application.
 This module provides the core API for the intelligent tutoring system:
 - get_unit(): Retrieve questions for a specific unit
 - get_answer(): Generate answers using MCP and LLM
+- get_answers_batch(): Generate answers for several questions concurrently
 - generate_cat_quiz(): Create random quizzes from past papers
 - CLI interface for backend testing
 
@@ -17,16 +18,23 @@ Design Principles:
 
 import sys
 import os
-import random
+import asyncio
+import atexit
 import logging
-from typing import List, Dict, Optional, Tuple
+import threading
+from typing import List, Dict, Optional, Tuple, Iterator
 from datetime import datetime
+from pathlib import Path
+
+import numpy as np
 
 # Add project root to path
-sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+ROOT = str(Path(__file__).resolve().parents[1])
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
 
 from scripts.load_data import load_questions, QuestionLoader
-from mcp.client import MCPClient
+from mcp.client import MCPClient, gather_bounded
 from scripts.prompts import get_available_modes
 
 # Configure logging
@@ -36,6 +44,12 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Shared random generator for quiz sampling
+_RNG = np.random.default_rng()
+
+# Set ANSWER_CACHE=1 to let get_app() reuse answers for near-duplicate questions
+ANSWER_CACHE_ENABLED = os.environ.get("ANSWER_CACHE", "0").lower() in ("1", "true", "yes")
+
 
 class ITutorApp:
     """
@@ -48,34 +62,68 @@ class ITutorApp:
         question_loader (QuestionLoader): Loads and manages questions
         mcp_client (MCPClient): Routes questions to LLM
         default_mode (str): Default answer mode
+        answer_cache (SemanticAnswerCache): Optional cache of generated answers
+        rag_system (RAGSystem): Past-paper retrieval, loaded on first use
     """
     
-    def __init__(self, default_mode: str = "exam"):
+    def __init__(self, default_mode: str = "exam", answer_cache=None, rag_system=None):
         """
         Initialize I-TUTOR application.
         
         Args:
             default_mode: Default answer mode (exam, local, global, mixed)
+            answer_cache: Optional SemanticAnswerCache consulted by
+                          get_answer() before calling the LLM, e.g.
+                          SemanticAnswerCache(EmbeddingGenerator().embed_text)
+            rag_system: Optional RAGSystem used by
+                        get_answers_with_context_batch(). If None, it is
+                        initialized the first time it is needed.
         """
         logger.info("Initializing I-TUTOR Application")
         
         # Initialize question loader
         try:
             self.question_loader = load_questions()
-            logger.info(f"✓ Loaded {len(self.question_loader.get_all_questions())} questions")
+            logger.info("✓ Loaded %d questions", len(self.question_loader.get_all_questions()))
         except Exception as e:
-            logger.error(f"Failed to load questions: {e}")
+            logger.error("Failed to load questions: %s", e)
             raise
         
         # Initialize MCP client
         try:
             self.mcp_client = MCPClient(default_mode=default_mode)
+            atexit.register(self.mcp_client.close)
             logger.info("✓ MCP Client initialized")
         except Exception as e:
-            logger.error(f"Failed to initialize MCP client: {e}")
+            logger.error("Failed to initialize MCP client: %s", e)
             raise
         
         self.default_mode = default_mode
+        
+        self.answer_cache = answer_cache
+        if answer_cache is not None:
+            atexit.register(answer_cache.save)
+        
+        self.rag_system = rag_system
+        self._rag_init_failed = False
+        
+        # Lookup caches. The question set does not change after loading,
+        # so results are computed once per instance (see clear_cache()).
+        self._unit_cache: Dict[str, List[Dict]] = {}
+        self._units_cache: Optional[List[str]] = None
+        self._years_cache: Optional[List[str]] = None
+        self._stats_cache: Optional[Dict] = None
+    
+    def clear_cache(self) -> None:
+        """
+        Clear cached unit, year and statistics lookups.
+        
+        Call this after reloading questions in question_loader.
+        """
+        self._unit_cache.clear()
+        self._units_cache = None
+        self._years_cache = None
+        self._stats_cache = None
     
     def get_unit(self, unit_name: str) -> List[Dict]:
         """
@@ -85,21 +133,26 @@ class ITutorApp:
             unit_name: Unit code (e.g., "BBIT106", "ISO100")
         
         Returns:
-            List of question dictionaries for the unit
+            List of question dictionaries for the unit. The list is cached
+            and shared between calls, so callers must not modify it.
         
         Example:
             >>> app = ITutorApp()
             >>> questions = app.get_unit("BBIT106")
             >>> print(f"Found {len(questions)} questions")
         """
-        logger.info(f"Retrieving questions for unit: {unit_name}")
+        unit_key = unit_name.strip().upper()
         
-        questions = self.question_loader.filter_by_unit(unit_name)
+        questions = self._unit_cache.get(unit_key)
+        if questions is None:
+            logger.info("Retrieving questions for unit: %s", unit_name)
+            questions = self.question_loader.filter_by_unit(unit_key)
+            self._unit_cache[unit_key] = questions
         
         if not questions:
-            logger.warning(f"No questions found for unit: {unit_name}")
+            logger.warning("No questions found for unit: %s", unit_name)
         else:
-            logger.info(f"Found {len(questions)} questions for {unit_name}")
+            logger.info("Found %d questions for %s", len(questions), unit_name)
         
         return questions
     
@@ -139,7 +192,17 @@ class ITutorApp:
         if mode is None:
             mode = self.default_mode
         
-        logger.info(f"Generating answer in '{mode}' mode")
+        # Answers with context depend on the retrieved papers, so only
+        # plain questions go through the answer cache
+        embedding = None
+        if self.answer_cache is not None and not context:
+            embedding = self.answer_cache.embed(question)
+            cached = self.answer_cache.lookup(embedding, mode)
+            if cached is not None:
+                logger.info("Answer served from cache (cache=hit, mode=%s)", mode)
+                return cached
+        
+        logger.info("Generating answer in '%s' mode", mode)
         
         # Use MCP client to generate answer
         if context:
@@ -152,12 +215,207 @@ class ITutorApp:
             answer = self.mcp_client.answer_question(question, mode=mode)
         
         if answer:
-            logger.info(f"Answer generated successfully ({len(answer)} chars)")
+            if logger.isEnabledFor(logging.INFO):
+                logger.info("Answer generated successfully (%d chars)", len(answer))
+            if embedding is not None:
+                self.answer_cache.put(embedding, question, mode, answer)
         else:
             logger.warning("Failed to generate answer")
         
         return answer
     
+    def stream_answer(
+        self,
+        question: str,
+        mode: str = None,
+        context: str = None
+    ) -> Iterator[str]:
+        """
+        Generate an answer and yield it in chunks as the LLM produces them.
+        
+        Same routing as get_answer(), but the caller can render the first
+        tokens while the rest of the answer is still being generated. A
+        cached answer is yielded as a single chunk.
+        
+        Args:
+            question: The question to answer
+            mode: Answer mode (exam, local, global, mixed)
+                  If None, uses default_mode
+            context: Optional context from past papers (for RAG)
+        
+        Yields:
+            Answer text chunks
+        
+        Example:
+            >>> app = ITutorApp()
+            >>> for chunk in app.stream_answer("What is OOP?"):
+            ...     print(chunk, end="", flush=True)
+        """
+        # Use default mode if not specified
+        if mode is None:
+            mode = self.default_mode
+        
+        embedding = None
+        if self.answer_cache is not None and not context:
+            embedding = self.answer_cache.embed(question)
+            cached = self.answer_cache.lookup(embedding, mode)
+            if cached is not None:
+                logger.info("Answer served from cache (cache=hit, mode=%s)", mode)
+                yield cached
+                return
+        
+        logger.info("Streaming answer in '%s' mode", mode)
+        
+        chunks = []
+        for chunk in self.mcp_client.answer_question_stream(
+            question,
+            mode=mode,
+            context=context
+        ):
+            chunks.append(chunk)
+            yield chunk
+        
+        if chunks:
+            if embedding is not None:
+                self.answer_cache.put(embedding, question, mode, "".join(chunks))
+        else:
+            logger.warning("Failed to generate answer")
+    
+    def get_answers_batch(
+        self,
+        questions: List[str],
+        mode: str = None
+    ) -> List[Optional[str]]:
+        """
+        Generate answers for several questions concurrently.
+        
+        Requests are issued together with asyncio.gather() and bounded by
+        OLLAMA_NUM_PARALLEL, so a 5-question quiz takes roughly the time of
+        a single answer instead of five sequential ones.
+        
+        Args:
+            questions: List of questions to answer
+            mode: Answer mode for all questions (default: default_mode)
+        
+        Returns:
+            List of answers in the same order as questions. Entries are None
+            where generation failed.
+        
+        Example:
+            >>> app = ITutorApp()
+            >>> answers = app.get_answers_batch(
+            ...     ["What is OOP?", "What is a database?"],
+            ...     mode="exam"
+            ... )
+        """
+        if mode is None:
+            mode = self.default_mode
+        
+        if not questions:
+            return []
+        
+        logger.info("Generating %d answers in '%s' mode", len(questions), mode)
+        
+        answers = asyncio.run(self._gather_answers(questions, mode))
+        
+        if logger.isEnabledFor(logging.INFO):
+            logger.info(
+                "Generated %d/%d answers",
+                sum(1 for a in answers if a),
+                len(answers)
+            )
+        
+        return answers
+    
+    async def _gather_answers(
+        self,
+        questions: List[str],
+        mode: str,
+        contexts: Optional[List[str]] = None
+    ) -> List[Optional[str]]:
+        """Answer all questions (with optional per-question context), OLLAMA_NUM_PARALLEL at a time."""
+        if contexts is None:
+            contexts = [None] * len(questions)
+        
+        def answer(item: Tuple[str, Optional[str]]) -> Optional[str]:
+            question, context = item
+            return self.mcp_client.answer_question_with_context(
+                question,
+                context=context,
+                mode=mode
+            )
+        
+        return await gather_bounded(answer, list(zip(questions, contexts)))
+    
+    def _get_rag_system(self):
+        """
+        Return the RAG system, initializing it on first use.
+        
+        Returns:
+            RAGSystem, or None if it could not be initialized
+        """
+        if self.rag_system is None and not self._rag_init_failed:
+            try:
+                from scripts.rag import initialize_rag_system
+                self.rag_system = initialize_rag_system()
+            except ImportError as e:
+                logger.error("RAG dependencies not available: %s", e)
+            if self.rag_system is None:
+                self._rag_init_failed = True
+        
+        return self.rag_system
+    
+    def get_answers_with_context_batch(
+        self,
+        questions: List[str],
+        mode: str = None,
+        top_k: int = 3
+    ) -> List[Optional[str]]:
+        """
+        Generate answers for several questions using past-paper context.
+        
+        Context for all questions is retrieved with a single batched RAG
+        search, then the answers are generated concurrently as in
+        get_answers_batch(). Falls back to answers without context if the
+        RAG system is unavailable.
+        
+        Args:
+            questions: List of questions to answer
+            mode: Answer mode for all questions (default: default_mode)
+            top_k: Number of past papers to retrieve per question
+        
+        Returns:
+            List of answers in the same order as questions. Entries are None
+            where generation failed.
+        
+        Example:
+            >>> app = ITutorApp()
+            >>> quiz = app.generate_cat_quiz("BBIT106", num_questions=5)
+            >>> answers = app.get_answers_with_context_batch(
+            ...     [q["question"] for q in quiz["questions"]]
+            ... )
+        """
+        if not questions:
+            return []
+        
+        rag_system = self._get_rag_system()
+        if rag_system is None:
+            logger.warning("RAG system unavailable, answering without context")
+            return self.get_answers_batch(questions, mode=mode)
+        
+        if mode is None:
+            mode = self.default_mode
+        
+        from mcp.orchestrator import MCPOrchestrator
+        orchestrator = MCPOrchestrator(rag_system=rag_system, mcp_client=self.mcp_client)
+        
+        retrieved = rag_system.retrieve_batch(questions, top_k=top_k)
+        contexts = [orchestrator.format_context(r) for r in retrieved]
+        
+        logger.info("Generating %d answers with context in '%s' mode", len(questions), mode)
+        
+        return asyncio.run(self._gather_answers(questions, mode, contexts))
+    
     def generate_cat_quiz(
         self,
         unit: str,
@@ -184,25 +442,28 @@ class ITutorApp:
             >>> for i, q in enumerate(quiz, 1):
             ...     print(f"Q{i}: {q['question'][:100]}...")
         """
-        logger.info(f"Generating CAT quiz for {unit} ({num_questions} questions)")
+        logger.info("Generating CAT quiz for %s (%d questions)", unit, num_questions)
         
         # Get all questions for the unit
         unit_questions = self.get_unit(unit)
         
         if not unit_questions:
-            logger.warning(f"No questions available for {unit}")
+            logger.warning("No questions available for %s", unit)
             return None
         
         # Check if we have enough questions
         if len(unit_questions) < num_questions:
             logger.warning(
-                f"Unit {unit} has only {len(unit_questions)} questions, "
-                f"requested {num_questions}"
+                "Unit %s has only %d questions, requested %d",
+                unit,
+                len(unit_questions),
+                num_questions
             )
             num_questions = len(unit_questions)
         
-        # Randomly select questions
-        quiz_questions = random.sample(unit_questions, num_questions)
+        # Randomly select questions (indices drawn in one vectorized call)
+        idx = _RNG.choice(len(unit_questions), size=num_questions, replace=False)
+        quiz_questions = [unit_questions[i] for i in idx]
         
         # Add quiz metadata
         quiz = {
@@ -212,10 +473,35 @@ class ITutorApp:
             "questions": quiz_questions
         }
         
-        logger.info(f"Generated CAT quiz with {len(quiz_questions)} questions")
+        logger.info("Generated CAT quiz with %d questions", len(quiz_questions))
         
         return quiz
     
+    def generate_cat_quizzes(
+        self,
+        units: List[str],
+        num_questions: int = 5
+    ) -> Dict[str, Optional[Dict]]:
+        """
+        Generate one CAT quiz per unit (e.g. for a multi-unit mock exam).
+        
+        Args:
+            units: Unit codes to generate quizzes for
+            num_questions: Number of questions per quiz (default: 5)
+        
+        Returns:
+            Dictionary mapping each unit to its quiz, or None if the unit
+            has no questions
+        
+        Example:
+            >>> app = ITutorApp()
+            >>> quizzes = app.generate_cat_quizzes(["BBIT106", "ISO100"], 3)
+        """
+        return {
+            unit: self.generate_cat_quiz(unit, num_questions=num_questions)
+            for unit in units
+        }
+    
     def get_available_units(self) -> List[str]:
         """
         Get list of all available units.
@@ -223,8 +509,9 @@ class ITutorApp:
         Returns:
             List of unit codes
         """
-        units = self.question_loader.get_unique_units()
-        return sorted(list(units))
+        if self._units_cache is None:
+            self._units_cache = list(self.question_loader.get_sorted_units())
+        return self._units_cache
     
     def get_available_years(self) -> List[str]:
         """
@@ -233,8 +520,9 @@ class ITutorApp:
         Returns:
             List of years
         """
-        years = self.question_loader.get_unique_years()
-        return sorted(list(years))
+        if self._years_cache is None:
+            self._years_cache = list(self.question_loader.get_sorted_years())
+        return self._years_cache
     
     def get_statistics(self) -> Dict:
         """
@@ -243,7 +531,9 @@ class ITutorApp:
         Returns:
             Dictionary with statistics
         """
-        return self.question_loader.get_statistics()
+        if self._stats_cache is None:
+            self._stats_cache = self.question_loader.get_statistics()
+        return self._stats_cache
     
     def check_connection(self) -> bool:
         """
@@ -255,24 +545,54 @@ class ITutorApp:
         return self.mcp_client.check_connection()
 
 
+def create_answer_cache():
+    """
+    Create the persistent semantic answer cache.
+    
+    Returns:
+        SemanticAnswerCache, or None if its dependencies are unavailable
+    """
+    try:
+        from scripts.answer_cache import SemanticAnswerCache
+        from scripts.embeddings import EmbeddingGenerator
+        return SemanticAnswerCache(EmbeddingGenerator().embed_text)
+    except Exception as e:
+        logger.error("Answer cache unavailable: %s", e)
+        return None
+
+
 # Global app instance (lazy loaded)
 _app_instance: Optional[ITutorApp] = None
+_app_lock = threading.Lock()
 
 
-def get_app(default_mode: str = "exam") -> ITutorApp:
+def get_app(default_mode: str = "exam", use_answer_cache: Optional[bool] = None) -> ITutorApp:
     """
     Get or create the global app instance.
     
+    Thread-safe: concurrent first calls create a single instance.
+    
     Args:
         default_mode: Default answer mode
+        use_answer_cache: Create the app with a SemanticAnswerCache.
+                          Defaults to the ANSWER_CACHE environment variable.
     
     Returns:
         ITutorApp instance
     """
     global _app_instance
     
+    if use_answer_cache is None:
+        use_answer_cache = ANSWER_CACHE_ENABLED
+    
     if _app_instance is None:
-        _app_instance = ITutorApp(default_mode=default_mode)
+        with _app_lock:
+            if _app_instance is None:
+                answer_cache = create_answer_cache() if use_answer_cache else None
+                _app_instance = ITutorApp(
+                    default_mode=default_mode,
+                    answer_cache=answer_cache
+                )
     
     return _app_instance
 
@@ -325,10 +645,10 @@ def cli_interface():
         if choice == "1":
             # List units
             units = app.get_available_units()
+            questions_per_unit = app.get_statistics()['questions_per_unit']
             print(f"\nAvailable units ({len(units)}):")
             for unit in units:
-                questions = app.get_unit(unit)
-                print(f"  - {unit}: {len(questions)} questions")
+                print(f"  - {unit}: {questions_per_unit.get(unit, 0)} questions")
         
         elif choice == "2":
             # Get questions for unit
@@ -385,6 +705,22 @@ def cli_interface():
                 print(f"\n  Questions:")
                 for i, q in enumerate(quiz['questions'], 1):
                     print(f"    Q{i}: {q.get('question', '')[:80]}...")
+                
+                generate = input("\nGenerate answers for this quiz? (y/N): ").strip().lower()
+                if generate == "y":
+                    mode = input("Enter mode (exam/local/global/mixed) [exam]: ").strip().lower()
+                    if not mode:
+                        mode = "exam"
+                    
+                    print(f"\nGenerating {quiz['num_questions']} answers in {mode} mode...")
+                    answers = app.get_answers_batch(
+                        [q.get('question', '') for q in quiz['questions']],
+                        mode=mode
+                    )
+                    
+                    for i, answer in enumerate(answers, 1):
+                        print(f"\n  A{i}:")
+                        print(f"  {answer}" if answer else "  ❌ Failed to generate answer")
             else:
                 print(f"Failed to generate quiz for {unit}")
         
@@ -419,5 +755,5 @@ if __name__ == "__main__":
         print("\n\nInterrupted by user")
         sys.exit(0)
     except Exception as e:
-        logger.error(f"Unexpected error: {e}", exc_info=True)
+        logger.error("Unexpected error: %s", e, exc_info=True)
         sys.exit(1)
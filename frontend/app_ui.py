@@ -18,8 +18,11 @@ Date: November 30, 2025
 """
 
 import streamlit as st
+import hashlib
 import sys
-import os
+import threading
+from collections import OrderedDict
+from pathlib import Path
 from typing import Optional, List, Dict
 import logging
 
@@ -28,18 +31,13 @@ logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 # Add parent directory to path for imports
-sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+ROOT = str(Path(__file__).resolve().parents[1])
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
 
-# Import backend modules
-try:
-    from mcp.client import MCPClient
-    from scripts.rag import initialize_rag_system
-    from scripts.load_data import load_questions
-    from mcp.orchestrator import MCPOrchestrator
-except ImportError as e:
-    logger.error(f"Failed to import backend modules: {e}")
-    st.error("Failed to load backend modules. Please check installation.")
-    sys.exit(1)
+# Answers kept per browser session for resubmitted inputs (least recently
+# used are dropped first)
+ANSWER_CACHE_SIZE = 50
 
 
 # ============================================================================
@@ -53,99 +51,14 @@ st.set_page_config(
     initial_sidebar_state="expanded"
 )
 
-# Custom CSS for indigo/white/black theme
-st.markdown("""
-    <style>
-    /* Main theme colors */
-    :root {
-        --indigo: #4F46E5;
-        --indigo-dark: #4338CA;
-        --white: #FFFFFF;
-        --black: #1F2937;
-        --gray-light: #F3F4F6;
-        --gray-dark: #6B7280;
-    }
-    
-    /* Main container */
-    .main {
-        background-color: var(--white);
-        color: var(--black);
-    }
-    
-    /* Header styling */
-    .header-title {
-        color: var(--indigo);
-        font-size: 2.5em;
-        font-weight: 700;
-        margin-bottom: 0.5em;
-    }
-    
-    .header-subtitle {
-        color: var(--gray-dark);
-        font-size: 1.1em;
-        margin-bottom: 1.5em;
-    }
-    
-    /* Button styling */
-    .stButton > button {
-        background-color: var(--indigo);
-        color: var(--white);
-        border: none;
-        border-radius: 0.5em;
-        padding: 0.75em 2em;
-        font-weight: 600;
-        transition: background-color 0.3s;
-    }
-    
-    .stButton > button:hover {
-        background-color: var(--indigo-dark);
-    }
-    
-    /* Input styling */
-    .stTextInput > div > div > input,
-    .stTextArea > div > div > textarea {
-        border: 2px solid var(--indigo);
-        border-radius: 0.5em;
-        padding: 0.75em;
-    }
-    
-    /* Selectbox styling */
-    .stSelectbox > div > div > select {
-        border: 2px solid var(--indigo);
-        border-radius: 0.5em;
-    }
-    
-    /* Card styling */
-    .card {
-        background-color: var(--gray-light);
-        border-left: 4px solid var(--indigo);
-        padding: 1.5em;
-        border-radius: 0.5em;
-        margin: 1em 0;
-    }
-    
-    /* Success message */
-    .success-box {
-        background-color: #ECFDF5;
-        border-left: 4px solid #10B981;
-        padding: 1em;
-        border-radius: 0.5em;
-    }
-    
-    /* Info message */
-    .info-box {
-        background-color: #EFF6FF;
-        border-left: 4px solid var(--indigo);
-        padding: 1em;
-        border-radius: 0.5em;
-    }
-    
-    /* Sidebar styling */
-    .sidebar .sidebar-content {
-        background-color: var(--gray-light);
-    }
-    </style>
-""", unsafe_allow_html=True)
+@st.cache_data
+def _load_css() -> str:
+    """Read the theme stylesheet once; the cached text survives reruns."""
+    return Path(__file__).parent.joinpath("assets/theme.css").read_text(encoding="utf-8")
+
+
+# Custom CSS for indigo/white/black theme (frontend/assets/theme.css)
+st.markdown(f"<style>{_load_css()}</style>", unsafe_allow_html=True)
 
 
 # ============================================================================
@@ -155,49 +68,100 @@ st.markdown("""
 @st.cache_resource
 def initialize_backend():
     """
-    Initialize backend components (MCP client, RAG system).
+    Initialize the MCP client.
     Uses Streamlit caching to avoid re-initialization on every run.
     
+    Backend modules are imported here rather than at module level so that
+    script reruns do not pay for resolving them.
+    
     Returns:
-        Tuple of (mcp_client, rag_system, question_loader)
+        MCPClient instance
     """
     try:
         logger.info("Initializing backend components...")
         
-        # Initialize MCP client
+        from mcp.client import MCPClient
+        
         mcp_client = MCPClient(default_mode="local")
         logger.info("✓ MCP client initialized")
         
-        # Initialize RAG system
-        rag_system = initialize_rag_system(force_rebuild=False)
-        logger.info("✓ RAG system initialized")
+        return mcp_client
+    
+    except Exception as e:
+        logger.error("Failed to initialize backend: %s", e)
+        raise
+
+
+@st.cache_resource(max_entries=1)
+def load_question_data(data_version: str):
+    """
+    Load the question loader and RAG system for one version of the data.
+    
+    Cached per data_version (the questions file's mtime and size), so a
+    changed file gets a fresh loader and RAG index. Objects already shared
+    between sessions are never modified; sessions still holding the old
+    ones keep a consistent snapshot.
+    
+    Args:
+        data_version: get_file_version() of the questions file
+    
+    Returns:
+        Tuple of (rag_system, question_loader)
+    """
+    try:
+        from scripts.load_data import load_questions
+        
+        # Initialize RAG system (optional: answers still work without it).
+        # It rebuilds its index if the questions file is newer.
+        try:
+            from scripts.rag import initialize_rag_system
+            rag_system = initialize_rag_system(force_rebuild=False)
+            logger.info("✓ RAG system initialized")
+        except ImportError as e:
+            logger.error("Failed to import RAG system: %s", e)
+            st.error("Past paper retrieval is unavailable. Please check installation.")
+            rag_system = None
         
         # Initialize question loader
         question_loader = load_questions()
         logger.info("✓ Question loader initialized")
         
-        return mcp_client, rag_system, question_loader
+        return rag_system, question_loader
     
     except Exception as e:
-        logger.error(f"Failed to initialize backend: {e}")
+        logger.error("Failed to load question data: %s", e)
         raise
 
 
-@st.cache_resource
-def initialize_orchestrator():
+@st.cache_resource(max_entries=1)
+def initialize_orchestrator(_mcp_client, _rag_system, data_version: str):
     """
     Initialize MCP Orchestrator for intelligent RAG routing.
     
+    Reuses the backend's MCP client and RAG system so the FAISS index and
+    embedding model are only loaded once. The arguments are prefixed with
+    an underscore so Streamlit does not try to hash them; data_version
+    creates a new orchestrator when the RAG system is reloaded.
+    
+    Args:
+        _mcp_client: MCP client from initialize_backend()
+        _rag_system: RAG system from load_question_data() (may be None)
+        data_version: Version the RAG system was loaded for
+    
     Returns:
         MCPOrchestrator instance
     """
     try:
         logger.info("Initializing orchestrator...")
-        orchestrator = MCPOrchestrator()
+        from mcp.orchestrator import MCPOrchestrator
+        orchestrator = MCPOrchestrator(
+            rag_system=_rag_system,
+            mcp_client=_mcp_client
+        )
         logger.info("✓ Orchestrator initialized")
         return orchestrator
     except Exception as e:
-        logger.error(f"Failed to initialize orchestrator: {e}")
+        logger.error("Failed to initialize orchestrator: %s", e)
         return None
 
 
@@ -249,7 +213,7 @@ def format_retrieved_questions(questions: List[Dict]) -> str:
     if not questions:
         return "No relevant past papers found."
     
-    formatted = "📚 **Relevant Past Papers:**\n\n"
+    parts = ["📚 **Relevant Past Papers:**\n\n"]
     
     for i, q in enumerate(questions, 1):
         unit = q.get("unit", "Unknown")
@@ -257,10 +221,12 @@ def format_retrieved_questions(questions: List[Dict]) -> str:
         similarity = q.get("similarity_score", 0)
         question_text = q.get("question", "")[:150]
         
-        formatted += f"**[{i}] {unit} ({year})** - Relevance: {similarity:.0%}\n"
-        formatted += f"> {question_text}...\n\n"
+        parts.append(
+            f"**[{i}] {unit} ({year})** - Relevance: {similarity:.0%}\n"
+            f"> {question_text}...\n\n"
+        )
     
-    return formatted
+    return "".join(parts)
 
 
 def get_unit_statistics(question_loader) -> Dict:
@@ -274,20 +240,55 @@ def get_unit_statistics(question_loader) -> Dict:
         Dictionary with unit statistics
     """
     try:
-        all_questions = question_loader.get_all_questions()
-        
-        # Count questions per unit
-        units = {}
-        for q in all_questions:
-            unit = q.get("unit", "Unknown")
-            units[unit] = units.get(unit, 0) + 1
-        
-        return units
+        # Counted once when the loader built its unit index
+        return question_loader.get_unit_counts()
     except Exception as e:
-        logger.error(f"Failed to get unit statistics: {e}")
+        logger.error("Failed to get unit statistics: %s", e)
         return {}
 
 
+@st.cache_data(ttl=3600, show_spinner=False)
+def retrieve_past_papers(_rag_system, question: str, top_k: int, data_version: str) -> List[Dict]:
+    """
+    Retrieve similar past paper questions, cached across reruns and sessions.
+    
+    Args:
+        _rag_system: RAGSystem instance (not hashed by Streamlit)
+        question: User question
+        top_k: Number of past papers to retrieve
+        data_version: Version the RAG system was loaded for
+    
+    Returns:
+        List of retrieved question dictionaries
+    """
+    return _rag_system.retrieve_notes(
+        question,
+        top_k=top_k,
+        similarity_threshold=0.3
+    )
+
+
+@st.cache_data(show_spinner=False)
+def get_database_statistics(_question_loader, data_version: str) -> Dict:
+    """
+    Get the sidebar database statistics, cached across reruns.
+    
+    Recomputed only when data_version (the questions file's mtime and
+    size) changes.
+    
+    Args:
+        _question_loader: QuestionLoader instance (not hashed by Streamlit)
+        data_version: Version the question loader was loaded for
+    
+    Returns:
+        Dictionary with total_questions and questions_per_unit
+    """
+    return {
+        "total_questions": len(_question_loader.get_all_questions()),
+        "questions_per_unit": get_unit_statistics(_question_loader),
+    }
+
+
 # ============================================================================
 # MAIN UI LAYOUT
 # ============================================================================
@@ -297,8 +298,12 @@ def main():
     
     # Initialize backend
     try:
-        mcp_client, rag_system, question_loader = initialize_backend()
-        orchestrator = initialize_orchestrator()
+        from scripts.load_data import get_file_version
+        
+        data_version = get_file_version()
+        mcp_client = initialize_backend()
+        rag_system, question_loader = load_question_data(data_version)
+        orchestrator = initialize_orchestrator(mcp_client, rag_system, data_version)
     except Exception as e:
         st.error(f"Failed to initialize backend: {e}")
         st.info("Please ensure Ollama is running and all dependencies are installed.")
@@ -370,12 +375,12 @@ def main():
         st.markdown("### 📊 Database Statistics")
         
         try:
-            units = get_unit_statistics(question_loader)
-            all_questions = question_loader.get_all_questions()
+            stats = get_database_statistics(question_loader, data_version)
+            units = stats["questions_per_unit"]
             
             col1, col2 = st.columns(2)
             with col1:
-                st.metric("Total Questions", len(all_questions))
+                st.metric("Total Questions", stats["total_questions"])
             with col2:
                 st.metric("Units", len(units))
             
@@ -440,6 +445,7 @@ def main():
         )
     
     if clear_button:
+        st.session_state.pop("answer_cache", None)
         st.rerun()
     
     # ========================================================================
@@ -451,56 +457,82 @@ def main():
             st.warning("Please enter a question.")
             return
         
+        # Resubmitting inputs answered earlier in this session reuses the result
+        request_key = hashlib.sha1(
+            f"{question}|{mode}|{top_k}|{use_rag}".encode("utf-8")
+        ).hexdigest()
+        answer_cache = st.session_state.setdefault("answer_cache", OrderedDict())
+        cached = answer_cache.get(request_key)
+        if cached:
+            answer_cache.move_to_end(request_key)
+        
         # Show processing status
         with st.spinner("🔄 Processing your question..."):
             try:
                 # Step 1: Retrieve past papers if RAG enabled
                 retrieved_questions = []
-                if use_rag and rag_system:
-                    logger.info(f"Retrieving top {top_k} past papers...")
-                    retrieved_questions = rag_system.retrieve_notes(
-                        question,
-                        top_k=top_k,
-                        similarity_threshold=0.3
-                    )
-                    logger.info(f"Retrieved {len(retrieved_questions)} past papers")
+                if cached:
+                    retrieved_questions = cached[1]
+                elif use_rag and rag_system:
+                    # Let the LLM server load the model while retrieval runs
+                    threading.Thread(target=mcp_client.warm_up, daemon=True).start()
+                    
+                    logger.info("Retrieving top %d past papers...", top_k)
+                    retrieved_questions = retrieve_past_papers(rag_system, question, top_k, data_version)
+                    logger.info("Retrieved %d past papers", len(retrieved_questions))
                 
                 # Step 2: Generate answer using MCP + RAG
-                logger.info(f"Generating answer in '{mode}' mode...")
-                
-                if orchestrator and use_rag:
-                    # Use orchestrator for intelligent RAG routing
-                    answer = orchestrator.answer_question(
-                        question,
-                        mode=mode,
-                        use_rag=True,
-                        top_k=top_k
-                    )
-                else:
-                    # Use MCP client directly
-                    answer = mcp_client.answer_question(
-                        question,
-                        mode=mode
-                    )
-                
-                logger.info("Answer generated successfully")
-                
-                # Display results
-                st.success("✅ Answer generated successfully!")
+                logger.info("Generating answer in '%s' mode...", mode)
                 
                 # Create tabs for answer and context
                 tab1, tab2 = st.tabs(["📖 Answer", "📚 Context"])
                 
                 with tab1:
                     st.markdown("### AI Answer")
-                    st.markdown(
-                        f"""
-                        <div class="card">
-                        {format_answer_display(answer)}
-                        </div>
-                        """,
-                        unsafe_allow_html=True
-                    )
+                    
+                    if cached:
+                        answer = cached[0]
+                    elif orchestrator and use_rag:
+                        # Use orchestrator for intelligent RAG routing,
+                        # rendering tokens as they arrive
+                        answer = st.write_stream(
+                            orchestrator.answer_question_stream(
+                                question,
+                                mode=mode,
+                                use_rag=True,
+                                top_k=top_k,
+                                # Reuse the retrieval above instead of repeating it
+                                retrieved=retrieved_questions if rag_system else None
+                            )
+                        )
+                    else:
+                        # Use MCP client directly, rendering tokens as they arrive
+                        answer = st.write_stream(
+                            mcp_client.answer_question_stream(
+                                question,
+                                mode=mode
+                            )
+                        )
+                    
+                    if not answer:
+                        raise RuntimeError("No answer returned by the model")
+                    
+                    if cached:
+                        st.markdown(
+                            f"""
+                            <div class="card">
+                            {format_answer_display(answer)}
+                            </div>
+                            """,
+                            unsafe_allow_html=True
+                        )
+                    
+                    answer_cache[request_key] = (answer, retrieved_questions)
+                    if len(answer_cache) > ANSWER_CACHE_SIZE:
+                        answer_cache.popitem(last=False)
+                    
+                    logger.info("Answer generated successfully")
+                    st.success("✅ Answer generated successfully!")
                     
                     # Display metadata
                     col1, col2, col3 = st.columns(3)
@@ -530,7 +562,7 @@ def main():
                         st.info("No relevant past papers found for this query.")
             
             except Exception as e:
-                logger.error(f"Error generating answer: {e}")
+                logger.error("Error generating answer: %s", e)
                 st.error(f"Error generating answer: {e}")
                 st.info("Please ensure Ollama is running and try again.")
     
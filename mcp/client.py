@@ -17,50 +17,190 @@ Modes:
 
 import sys
 import os
-from typing import Optional, Dict
+import asyncio
+import json
+import time
+from pathlib import Path
+from typing import Any, Callable, Optional, Dict, Iterator, List, Tuple
 
 # Add parent directory to path for imports
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from scripts.ollama_client import OllamaClient, query_model
-from scripts.prompts import format_prompt, validate_mode, get_available_modes
+from scripts.vllm_client import VLLMClient
+from scripts.prompts import (
+    format_user_prompt,
+    get_system_prompt,
+    validate_mode,
+    get_available_modes
+)
 import logging
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Maximum number of LLM requests kept in flight by the batch helpers.
+# Should match the OLLAMA_NUM_PARALLEL setting of the Ollama server; requests
+# beyond the server's limit are queued server-side anyway.
+OLLAMA_NUM_PARALLEL = int(os.environ.get("OLLAMA_NUM_PARALLEL", "4"))
+
+# Supported LLM servers: backend name -> (client class, default URL, default model)
+LLM_BACKENDS = {
+    "ollama": (OllamaClient, "http://localhost:11434", "llama2"),
+    "vllm": (VLLMClient, "http://localhost:8000", "meta-llama/Llama-2-7b-chat-hf"),
+}
+
+# Pre-quantized Llama-2 7B chat checkpoints per backend. Quantized weights
+# halve (int8) or quarter (4-bit) the bytes read per generated token.
+# vLLM must be started with the matching --quantization flag.
+QUANTIZED_MODELS = {
+    "ollama": {
+        "q4": "llama2:7b-chat-q4_K_M",
+        "q8": "llama2:7b-chat-q8_0",
+    },
+    "vllm": {
+        "awq": "TheBloke/Llama-2-7B-Chat-AWQ",
+        "gptq": "TheBloke/Llama-2-7B-Chat-GPTQ",
+    },
+}
+
+# OpenAI-compatible server and model for offline batch jobs (Batch API).
+# The interactive model is an Ollama/vLLM tag the batch server does not know,
+# so both must be set before submit_batch() sends anything. The API key is
+# read from OPENAI_API_KEY.
+BATCH_API_URL = os.environ.get("LLM_BATCH_API_URL") or None
+BATCH_MODEL = os.environ.get("LLM_BATCH_MODEL") or None
+
+# Terminal states of a Batch API job
+BATCH_FINAL_STATES = {"completed", "failed", "expired", "cancelled"}
+
+
+async def gather_bounded(
+    fn: Callable[[Any], Optional[str]],
+    items: List[Any],
+    max_concurrency: int = OLLAMA_NUM_PARALLEL,
+    on_result: Optional[Callable[[Any, Optional[str]], None]] = None
+) -> List[Optional[str]]:
+    """
+    Call a blocking LLM function for every item, max_concurrency at a time.
+    
+    Each call runs in a worker thread via asyncio.to_thread() and all calls
+    are started together with asyncio.gather(). Shared by the batch helpers
+    of MCPClient, MCPOrchestrator and ITutorApp.
+    
+    Args:
+        fn: Blocking function taking one item (e.g. a question or a
+            (question, context) pair) and returning an answer
+        items: Items to process
+        max_concurrency: Maximum number of simultaneous calls
+        on_result: Optional callback(item, answer) run in the event loop
+                   after each successful call (e.g. to save a checkpoint)
+    
+    Returns:
+        Answers in the same order as items. Entries are None where the
+        call raised.
+    """
+    semaphore = asyncio.Semaphore(max_concurrency)
+    
+    async def bounded(item: Any) -> Optional[str]:
+        async with semaphore:
+            result = await asyncio.to_thread(fn, item)
+        if on_result is not None:
+            on_result(item, result)
+        return result
+    
+    results = await asyncio.gather(
+        *(bounded(item) for item in items),
+        return_exceptions=True
+    )
+    
+    answers = []
+    for result in results:
+        if isinstance(result, BaseException):
+            logger.error(f"Failed to answer question: {result}")
+            result = None
+        answers.append(result)
+    return answers
+
+
+def _load_checkpoint(path: Path) -> Dict[str, str]:
+    """Load saved batch answers, or an empty dict if there is no checkpoint."""
+    path = Path(path)
+    if not path.exists():
+        return {}
+    return json.loads(path.read_text(encoding="utf-8"))
+
+
+def _save_checkpoint(path: Path, answers: Dict[str, str]) -> None:
+    """Write batch answers atomically (a crash never leaves a partial file)."""
+    path = Path(path)
+    tmp_path = path.with_name(path.name + ".tmp")
+    tmp_path.write_text(json.dumps(answers, ensure_ascii=False), encoding="utf-8")
+    tmp_path.replace(path)
+
 
 class MCPClient:
     """
     MCP (Model Coordination Protocol) Client.
     
     Routes questions to appropriate answer modes and coordinates
-    with the local Ollama LLM for response generation.
+    with the local LLM server (Ollama or vLLM) for response generation.
     
     Attributes:
-        ollama_client (OllamaClient): Client for Ollama communication
+        llm_client (OllamaClient | VLLMClient): Client for the LLM server
         default_mode (str): Default answer mode
         temperature_map (dict): Temperature settings per mode
     """
     
     def __init__(
         self,
-        model: str = "llama2",
+        model: str = None,
         default_mode: str = "exam",
-        base_url: str = "http://localhost:11434"
+        base_url: str = None,
+        backend: str = None,
+        quantization: str = None
     ):
         """
         Initialize MCP Client.
         
         Args:
-            model: LLM model name (default: llama2)
+            model: LLM model name (default: llama2 for Ollama,
+                   meta-llama/Llama-2-7b-chat-hf for vLLM)
             default_mode: Default answer mode (default: exam)
-            base_url: Ollama server URL
+            base_url: LLM server URL (default: the backend's local URL)
+            backend: 'ollama' or 'vllm' (default: LLM_BACKEND environment
+                     variable, or 'ollama')
+            quantization: Use a quantized model when model is not given
+                          ('q4'/'q8' for Ollama, 'awq'/'gptq' for vLLM;
+                          default: LLM_QUANTIZATION environment variable)
         """
-        self.ollama_client = OllamaClient(base_url=base_url, model=model)
+        if backend is None:
+            backend = os.environ.get("LLM_BACKEND", "ollama")
+        if backend not in LLM_BACKENDS:
+            raise ValueError(f"Unknown LLM backend: {backend}. Available: {list(LLM_BACKENDS)}")
+        
+        client_class, default_url, default_model = LLM_BACKENDS[backend]
+        
+        if quantization is None:
+            quantization = os.environ.get("LLM_QUANTIZATION") or None
+        if quantization is not None:
+            quantized = QUANTIZED_MODELS[backend]
+            if quantization not in quantized:
+                raise ValueError(
+                    f"Unknown quantization for {backend}: {quantization}. "
+                    f"Available: {list(quantized)}"
+                )
+            default_model = quantized[quantization]
+        
+        model = model or default_model
+        self.backend = backend
+        self.llm_client = client_class(base_url=base_url or default_url, model=model)
         self.default_mode = default_mode
         
+        # OpenAI SDK client for offline batches, created on first use
+        self._batch_client = None
+        
         # Temperature settings per mode
         # Lower temp = more focused/deterministic
         # Higher temp = more creative/varied
@@ -71,32 +211,27 @@ class MCPClient:
             "mixed": 0.6      # Medium-low for balanced answers
         }
         
-        logger.info(f"MCPClient initialized with model: {model}, mode: {default_mode}")
+        logger.info(f"MCPClient initialized with {backend} model: {model}, mode: {default_mode}")
     
-    def answer_question(
+    @property
+    def ollama_client(self):
+        """Deprecated alias for llm_client, kept for existing callers."""
+        return self.llm_client
+    
+    def _resolve_mode(
         self,
-        question: str,
         mode: str = None,
         temperature: float = None
-    ) -> Optional[str]:
+    ) -> Optional[Tuple[str, str, float]]:
         """
-        Generate an answer for a question in the specified mode.
-        
-        This is the main method that:
-        1. Validates the mode
-        2. Formats the question with appropriate prompt template
-        3. Sends to LLM with appropriate temperature
-        4. Returns the generated answer
+        Validate the mode and resolve its system prompt and temperature.
         
-        Args:
-            question: The question to answer
-            mode: Answer mode ('exam', 'local', 'global', 'mixed')
-                  If None, uses default_mode
-            temperature: Sampling temperature (0.0-1.0)
-                        If None, uses temperature_map for mode
+        Everything returned is the same for every question in a mode, so
+        batches resolve it once instead of per question.
         
         Returns:
-            Generated answer string, or None if generation fails
+            Tuple of (mode, system_prompt, temperature), or None if the
+            mode is invalid
         """
         # Use default mode if not specified
         if mode is None:
@@ -111,18 +246,74 @@ class MCPClient:
         if temperature is None:
             temperature = self.temperature_map.get(mode, 0.7)
         
+        return mode, get_system_prompt(mode), temperature
+    
+    def _prepare_request(
+        self,
+        question: str,
+        mode: str = None,
+        temperature: float = None
+    ) -> Optional[Tuple[str, str, float]]:
+        """
+        Validate the mode and build the prompts and temperature for a question.
+        
+        The system prompt is the same for every question in a mode and is
+        sent separately, so the LLM server can reuse its cached prefix.
+        
+        Returns:
+            Tuple of (system_prompt, user_prompt, temperature), or None if
+            the mode is invalid
+        """
+        resolved = self._resolve_mode(mode, temperature)
+        if resolved is None:
+            return None
+        mode, system_prompt, temperature = resolved
+        
         logger.info(f"Answering question in '{mode}' mode (temp={temperature})")
         
         # Format question with appropriate prompt template
-        formatted_prompt = format_prompt(question, mode)
-        if formatted_prompt is None:
+        user_prompt = format_user_prompt(question, mode)
+        if user_prompt is None:
             logger.error(f"Failed to format prompt for mode: {mode}")
             return None
         
+        return system_prompt, user_prompt, temperature
+    
+    def answer_question(
+        self,
+        question: str,
+        mode: str = None,
+        temperature: float = None
+    ) -> Optional[str]:
+        """
+        Generate an answer for a question in the specified mode.
+        
+        This is the main method that:
+        1. Validates the mode
+        2. Formats the question with appropriate prompt template
+        3. Sends to LLM with appropriate temperature
+        4. Returns the generated answer
+        
+        Args:
+            question: The question to answer
+            mode: Answer mode ('exam', 'local', 'global', 'mixed')
+                  If None, uses default_mode
+            temperature: Sampling temperature (0.0-1.0)
+                        If None, uses temperature_map for mode
+        
+        Returns:
+            Generated answer string, or None if generation fails
+        """
+        request = self._prepare_request(question, mode, temperature)
+        if request is None:
+            return None
+        system_prompt, user_prompt, temperature = request
+        
         # Send to LLM and get response
-        answer = self.ollama_client.query_model(
-            formatted_prompt,
-            temperature=temperature
+        answer = self.llm_client.query_model(
+            user_prompt,
+            temperature=temperature,
+            system=system_prompt
         )
         
         if answer:
@@ -157,38 +348,357 @@ class MCPClient:
         
         return self.answer_question(combined_prompt, mode)
     
+    def answer_question_stream(
+        self,
+        question: str,
+        mode: str = None,
+        context: str = None
+    ) -> Iterator[str]:
+        """
+        Generate an answer and yield it in chunks as the LLM produces them.
+        
+        Intended for UIs (e.g. st.write_stream) where showing the first
+        tokens early matters more than receiving a single string.
+        
+        Args:
+            question: The question to answer
+            mode: Answer mode ('exam', 'local', 'global', 'mixed')
+            context: Optional context from past papers (for RAG)
+        
+        Yields:
+            Answer text chunks
+        """
+        if context:
+            question = f"CONTEXT:\n{context}\n\nQUESTION:\n{question}"
+        
+        request = self._prepare_request(question, mode)
+        if request is None:
+            return
+        system_prompt, user_prompt, temperature = request
+        
+        yield from self.llm_client.stream_model(
+            user_prompt,
+            temperature=temperature,
+            system=system_prompt
+        )
+    
+    async def answer_question_async(
+        self,
+        question: str,
+        mode: str = None,
+        temperature: float = None
+    ) -> Optional[str]:
+        """
+        Asynchronous version of answer_question().
+        
+        The blocking HTTP call runs in a worker thread so several questions
+        can be in flight against the LLM server at the same time
+        (see OLLAMA_NUM_PARALLEL).
+        
+        Args:
+            question: The question to answer
+            mode: Answer mode ('exam', 'local', 'global', 'mixed')
+            temperature: Sampling temperature (0.0-1.0)
+        
+        Returns:
+            Generated answer string, or None if generation fails
+        """
+        return await asyncio.to_thread(
+            self.answer_question,
+            question,
+            mode,
+            temperature
+        )
+    
+    async def abatch_answer_questions(
+        self,
+        questions: list,
+        mode: str = None,
+        max_concurrency: int = OLLAMA_NUM_PARALLEL,
+        checkpoint_path: Optional[Path] = None,
+        checkpoint_every: int = 25,
+        num_predict: int = 512
+    ) -> Dict[str, Optional[str]]:
+        """
+        Generate answers for multiple questions concurrently.
+        
+        Requests are run by gather_bounded(), at most max_concurrency at a
+        time. The mode, system prompt and
+        temperature are resolved once for the whole batch.
+        
+        With checkpoint_path, answers are saved every checkpoint_every
+        completions and at the end. Questions already answered in an
+        existing checkpoint are skipped, so an interrupted batch resumes
+        where it stopped.
+        
+        Args:
+            questions: List of questions to answer
+            mode: Answer mode for all questions
+            max_concurrency: Maximum number of simultaneous LLM requests
+            checkpoint_path: Optional JSON file for saving/resuming progress
+            checkpoint_every: Completed answers between checkpoint writes
+            num_predict: Maximum tokens to generate per answer
+        
+        Returns:
+            Dictionary mapping questions to answers (None where generation failed)
+        """
+        resolved = self._resolve_mode(mode)
+        if resolved is None:
+            return {question: None for question in questions}
+        mode, system_prompt, temperature = resolved
+        
+        done = _load_checkpoint(checkpoint_path) if checkpoint_path else {}
+        pending = [q for q in dict.fromkeys(questions) if q not in done]
+        if done:
+            logger.info(f"Resuming from checkpoint: {len(done)} answers already saved")
+        
+        completed = 0
+        
+        def answer(question: str) -> Optional[str]:
+            return self.llm_client.query_model(
+                format_user_prompt(question, mode),
+                temperature=temperature,
+                num_predict=num_predict,
+                system=system_prompt
+            )
+        
+        def record(question: str, answer: Optional[str]) -> None:
+            nonlocal completed
+            if answer is not None:
+                done[question] = answer
+            completed += 1
+            if checkpoint_path and completed % checkpoint_every == 0:
+                _save_checkpoint(checkpoint_path, done)
+        
+        logger.info(
+            f"Batch: {len(pending)} questions, mode={mode} "
+            f"(temp={temperature}, concurrency={max_concurrency})"
+        )
+        await gather_bounded(answer, pending, max_concurrency, on_result=record)
+        
+        if checkpoint_path:
+            _save_checkpoint(checkpoint_path, done)
+        
+        answers = {question: done.get(question) for question in questions}
+        answered = sum(answer is not None for answer in answers.values())
+        logger.info(f"Batch finished: {answered}/{len(answers)} questions answered")
+        return answers
+    
     def batch_answer_questions(
         self,
         questions: list,
-        mode: str = None
+        mode: str = None,
+        max_concurrency: int = OLLAMA_NUM_PARALLEL,
+        checkpoint_path: Optional[Path] = None,
+        offline: bool = False,
+        num_predict: int = 512
     ) -> Dict[str, Optional[str]]:
         """
         Generate answers for multiple questions.
         
+        Synchronous wrapper around abatch_answer_questions(). With
+        offline=True the questions are sent as one Batch API job instead
+        (see submit_batch()) and this call blocks until the job finishes.
+        
         Args:
             questions: List of questions to answer
             mode: Answer mode for all questions
+            max_concurrency: Maximum number of simultaneous LLM requests
+            checkpoint_path: Optional JSON file for saving/resuming progress
+            offline: Use the Batch API (for large, non-interactive workloads)
+            num_predict: Maximum tokens to generate per answer
         
         Returns:
             Dictionary mapping questions to answers
         """
-        results = {}
+        if offline:
+            job_id = self.submit_batch(questions, mode, num_predict)
+            if job_id is None:
+                return {question: None for question in questions}
+            self.poll_batch(job_id)
+            return self.fetch_batch_results(job_id, questions)
         
-        for i, question in enumerate(questions, 1):
-            logger.info(f"Processing question {i}/{len(questions)}")
-            answer = self.answer_question(question, mode)
-            results[question] = answer
+        return asyncio.run(
+            self.abatch_answer_questions(
+                questions,
+                mode,
+                max_concurrency,
+                checkpoint_path=checkpoint_path,
+                num_predict=num_predict
+            )
+        )
+    
+    def _get_batch_client(self):
+        """Create the OpenAI SDK client used for Batch API jobs."""
+        if self._batch_client is None:
+            try:
+                from openai import OpenAI
+            except ImportError:
+                raise ImportError(
+                    "Offline batches need the OpenAI SDK. Install with: pip install openai"
+                )
+            self._batch_client = OpenAI(base_url=BATCH_API_URL)
+        return self._batch_client
+    
+    def submit_batch(
+        self,
+        questions: List[str],
+        mode: str = None,
+        num_predict: int = 512
+    ) -> Optional[str]:
+        """
+        Submit questions as an offline Batch API job.
+        
+        Each unique question becomes one /v1/chat/completions request for
+        BATCH_MODEL in a JSONL input file. Batch jobs finish within 24 hours
+        and cost about half as much as online requests, which suits
+        evaluation runs over all past questions.
+        
+        Args:
+            questions: List of questions to answer
+            mode: Answer mode for all questions
+            num_predict: Maximum tokens to generate per answer
+        
+        Returns:
+            Batch job ID, or None if the mode is invalid or the batch
+            server/model is not configured
+        """
+        if not BATCH_API_URL or not BATCH_MODEL:
+            logger.error(
+                "Offline batches need LLM_BATCH_API_URL and LLM_BATCH_MODEL to be set"
+            )
+            return None
+        
+        resolved = self._resolve_mode(mode)
+        if resolved is None:
+            return None
+        mode, system_prompt, temperature = resolved
+        
+        lines = []
+        for i, question in enumerate(dict.fromkeys(questions)):
+            user_prompt = format_user_prompt(question, mode)
+            lines.append(json.dumps({
+                "custom_id": str(i),
+                "method": "POST",
+                "url": "/v1/chat/completions",
+                "body": {
+                    "model": BATCH_MODEL,
+                    "messages": [
+                        {"role": "system", "content": system_prompt},
+                        {"role": "user", "content": user_prompt}
+                    ],
+                    "temperature": temperature,
+                    "max_tokens": num_predict
+                }
+            }, ensure_ascii=False))
+        
+        client = self._get_batch_client()
+        input_file = client.files.create(
+            file=("batch_input.jsonl", "\n".join(lines).encode("utf-8")),
+            purpose="batch"
+        )
+        batch = client.batches.create(
+            input_file_id=input_file.id,
+            endpoint="/v1/chat/completions",
+            completion_window="24h"
+        )
         
-        return results
+        logger.info(f"✓ Submitted batch {batch.id} with {len(lines)} questions")
+        return batch.id
+    
+    def poll_batch(
+        self,
+        job_id: str,
+        interval: float = 30.0,
+        timeout: float = None
+    ) -> str:
+        """
+        Wait for a Batch API job to finish.
+        
+        Args:
+            job_id: Batch job ID from submit_batch()
+            interval: Seconds between status checks
+            timeout: Give up after this many seconds (None = wait until done)
+        
+        Returns:
+            Last job status ('completed', 'failed', 'expired', 'cancelled',
+            or the current status on timeout)
+        """
+        client = self._get_batch_client()
+        start = time.monotonic()
+        
+        while True:
+            batch = client.batches.retrieve(job_id)
+            if batch.status in BATCH_FINAL_STATES:
+                break
+            if timeout is not None and time.monotonic() - start >= timeout:
+                logger.warning(f"Batch {job_id} still {batch.status} after {timeout}s")
+                break
+            time.sleep(interval)
+        
+        logger.info(f"Batch {job_id} status: {batch.status}")
+        return batch.status
+    
+    def fetch_batch_results(
+        self,
+        job_id: str,
+        questions: List[str]
+    ) -> Dict[str, Optional[str]]:
+        """
+        Download the answers of a finished Batch API job.
+        
+        Args:
+            job_id: Batch job ID from submit_batch()
+            questions: The questions passed to submit_batch()
+        
+        Returns:
+            Dictionary mapping questions to answers (None where the request
+            failed or the job has no output)
+        """
+        client = self._get_batch_client()
+        batch = client.batches.retrieve(job_id)
+        
+        answers = {}
+        if batch.output_file_id:
+            output = client.files.content(batch.output_file_id).text
+            for line in output.splitlines():
+                if not line.strip():
+                    continue
+                result = json.loads(line)
+                response = result.get("response") or {}
+                if response.get("status_code") != 200:
+                    continue
+                choices = response.get("body", {}).get("choices", [])
+                if choices:
+                    answers[result["custom_id"]] = choices[0]["message"]["content"].strip()
+        else:
+            logger.warning(f"Batch {job_id} has no output (status: {batch.status})")
+        
+        ids = {question: str(i) for i, question in enumerate(dict.fromkeys(questions))}
+        logger.info(f"Fetched {len(answers)}/{len(ids)} answers from batch {job_id}")
+        return {question: answers.get(ids[question]) for question in questions}
     
     def check_connection(self) -> bool:
         """
-        Check if Ollama server is running and accessible.
+        Check if the LLM server is running and accessible.
         
         Returns:
             True if connection successful, False otherwise
         """
-        return self.ollama_client.check_connection()
+        return self.llm_client.check_connection()
+    
+    def warm_up(self) -> bool:
+        """
+        Load the model on the LLM server ahead of the first question.
+        
+        Returns:
+            True if the model is loaded, False otherwise
+        """
+        return self.llm_client.warm_up()
+    
+    def close(self) -> None:
+        """Release HTTP connections held by the LLM client."""
+        self.llm_client.close()
     
     def get_available_modes(self) -> list:
         """
@@ -17,12 +17,13 @@ Orchestration Logic:
 6. Return augmented answer
 """
 
+import asyncio
 import logging
-from typing import Optional, List, Dict, Tuple
+from typing import Optional, List, Dict, Iterator, Tuple
 import re
 
 from scripts.rag import RAGSystem, initialize_rag_system
-from mcp.client import MCPClient
+from mcp.client import MCPClient, gather_bounded
 from scripts.prompts import format_prompt
 
 # Configure logging
@@ -200,7 +201,8 @@ class MCPOrchestrator:
         query: str,
         mode: str = "exam",
         use_rag: Optional[bool] = None,
-        top_k: int = 3
+        top_k: int = 3,
+        retrieved: Optional[List[Dict]] = None
     ) -> Optional[str]:
         """
         Answer a question using RAG + MCP orchestration.
@@ -217,12 +219,91 @@ class MCPOrchestrator:
             mode: Answer mode (exam, local, global, mixed)
             use_rag: Override RAG decision (None = auto-decide)
             top_k: Number of past papers to retrieve
+            retrieved: Past papers already retrieved for this query; skips
+                       the RAG decision and retrieval
         
         Returns:
             Generated answer or None
         """
         logger.info(f"Answering question in '{mode}' mode with RAG orchestration")
         
+        context = self._build_context(query, use_rag, top_k, retrieved)
+        
+        # Send to MCP with context
+        logger.info("Sending to MCP client...")
+        
+        # Get answer from MCP
+        answer = self.mcp_client.answer_question_with_context(
+            query,
+            context=context if context else None,
+            mode=mode
+        )
+        
+        if answer:
+            logger.info(f"✓ Generated answer ({len(answer)} chars)")
+        else:
+            logger.warning("Failed to generate answer")
+        
+        return answer
+    
+    def answer_question_stream(
+        self,
+        query: str,
+        mode: str = "exam",
+        use_rag: Optional[bool] = None,
+        top_k: int = 3,
+        retrieved: Optional[List[Dict]] = None
+    ) -> Iterator[str]:
+        """
+        Answer a question using RAG + MCP orchestration, streaming the answer.
+        
+        Same orchestration as answer_question(), but the answer is yielded
+        in chunks as the model generates it (e.g. for st.write_stream).
+        
+        Args:
+            query: User query
+            mode: Answer mode (exam, local, global, mixed)
+            use_rag: Override RAG decision (None = auto-decide)
+            top_k: Number of past papers to retrieve
+            retrieved: Past papers already retrieved for this query; skips
+                       the RAG decision and retrieval
+        
+        Yields:
+            Answer text chunks
+        """
+        logger.info(f"Streaming answer in '{mode}' mode with RAG orchestration")
+        
+        context = self._build_context(query, use_rag, top_k, retrieved)
+        
+        yield from self.mcp_client.answer_question_stream(
+            query,
+            mode=mode,
+            context=context or None
+        )
+    
+    def _build_context(
+        self,
+        query: str,
+        use_rag: Optional[bool],
+        top_k: int,
+        retrieved: Optional[List[Dict]] = None
+    ) -> str:
+        """
+        Decide whether to use RAG and retrieve the past-paper context.
+        
+        Args:
+            query: User query
+            use_rag: Override RAG decision (None = auto-decide)
+            top_k: Number of past papers to retrieve
+            retrieved: Past papers already retrieved by the caller
+        
+        Returns:
+            Formatted context string ("" when RAG is not used)
+        """
+        if retrieved is not None:
+            logger.info(f"Using {len(retrieved)} past papers retrieved by the caller")
+            return self.format_context(retrieved)
+        
         # Decide whether to use RAG
         if use_rag is None:
             use_rag, confidence = self.should_use_rag(query)
@@ -242,55 +323,48 @@ class MCPOrchestrator:
             else:
                 logger.warning("No relevant past papers found")
         
-        # Send to MCP with context
-        logger.info("Sending to MCP client...")
-        
-        if context:
-            # Combine context with query
-            combined_query = f"{context}\n\nQUESTION:\n{query}"
-        else:
-            combined_query = query
-        
-        # Get answer from MCP
-        answer = self.mcp_client.answer_question_with_context(
-            combined_query,
-            context=context if context else None,
-            mode=mode
-        )
-        
-        if answer:
-            logger.info(f"✓ Generated answer ({len(answer)} chars)")
-        else:
-            logger.warning("Failed to generate answer")
-        
-        return answer
+        return context
     
     def batch_answer_questions(
         self,
         queries: List[str],
         mode: str = "exam",
-        use_rag: bool = True
+        use_rag: bool = True,
+        top_k: int = 3
     ) -> Dict[str, Optional[str]]:
         """
         Answer multiple questions with RAG orchestration.
         
+        Past papers for all queries are retrieved up front with a single
+        batched search, then the answers are generated concurrently.
+        
         Args:
             queries: List of queries
             mode: Answer mode
             use_rag: Whether to use RAG for all
+            top_k: Number of past papers to retrieve per query
         
         Returns:
             Dictionary mapping queries to answers
         """
         logger.info(f"Answering {len(queries)} questions with RAG orchestration")
         
-        results = {}
-        for i, query in enumerate(queries, 1):
-            logger.info(f"Processing query {i}/{len(queries)}")
-            answer = self.answer_question(query, mode=mode, use_rag=use_rag)
-            results[query] = answer
-        
-        return results
+        contexts = [""] * len(queries)
+        if use_rag and self.rag_system:
+            # One embedding batch and one FAISS search for all queries
+            retrieved = self.rag_system.retrieve_batch(queries, top_k=top_k)
+            contexts = [self.format_context(r) for r in retrieved]
+        
+        def answer(item: Tuple[str, str]) -> Optional[str]:
+            query, context = item
+            return self.mcp_client.answer_question_with_context(
+                query,
+                context=context or None,
+                mode=mode
+            )
+        
+        answers = asyncio.run(gather_bounded(answer, list(zip(queries, contexts))))
+        return dict(zip(queries, answers))
     
     def get_orchestration_stats(self) -> Dict:
         """
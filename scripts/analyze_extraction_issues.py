@@ -77,9 +77,9 @@ def analyze_unit_distribution(questions):
     for unit, data in units.items():
         analysis[unit] = {
             'count': data['count'],
-            'years': sorted(list(data['years'])),
+            'years': sorted(data['years']),
             'num_sources': len(data['sources']),
-            'sources': sorted(list(data['sources']))[:3]  # Show first 3 sources
+            'sources': sorted(data['sources'])[:3]  # Show first 3 sources
         }
     
     return analysis
@@ -102,7 +102,7 @@ def analyze_year_distribution(questions):
         analysis[year] = {
             'count': data['count'],
             'unique_units': len(data['units']),
-            'units': sorted(list(data['units']))
+            'units': sorted(data['units'])
         }
     
     return analysis
@@ -189,7 +189,7 @@ def main():
     unknown_analysis = analyze_unknown_units(questions)
     print(f"Total questions with 'Unknown' unit: {unknown_analysis['total_unknown']} ({unknown_analysis['percentage']})")
     print(f"\nBreakdown by year:")
-    for year in sorted(unknown_analysis['by_year'].keys()):
+    for year in sorted(unknown_analysis['by_year']):
         count = unknown_analysis['by_year'][year]
         print(f"  {year}: {count} questions")
     
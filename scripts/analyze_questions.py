@@ -114,7 +114,7 @@ def analyze_by_unit(questions: List[Dict]) -> Dict:
         keyword_counts = Counter(data["keywords"])
         results[unit] = {
             "count": data["count"],
-            "years": sorted(list(data["years"])),
+            "years": sorted(data["years"]),
             "top_keywords": keyword_counts.most_common(10)
         }
     
@@ -165,7 +165,7 @@ def generate_report(loader) -> None:
     # Analysis by unit
     unit_analysis = analyze_by_unit(questions)
     print(f"\n📚 ANALYSIS BY UNIT")
-    for unit in sorted(unit_analysis.keys()):
+    for unit in sorted(unit_analysis):
         data = unit_analysis[unit]
         print(f"\n  {unit}:")
         print(f"    Questions: {data['count']}")
@@ -0,0 +1,165 @@
+#!/usr/bin/env python3
+"""
+Semantic Answer Cache for LLM Responses.
+
+This module implements a persistent cache in front of answer generation:
+- Questions are embedded and looked up by cosine similarity (FAISS)
+- Answers are stored in SQLite together with the question and mode
+- Near-duplicate questions in the same mode reuse the stored answer
+- The FAISS index is persisted to disk alongside the SQLite database
+
+A cache hit skips the LLM round trip entirely (seconds → milliseconds),
+which helps repeated student questions and quiz re-runs.
+"""
+
+import numpy as np
+import faiss
+import logging
+import os
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Callable, Optional
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+class SemanticAnswerCache:
+    """
+    Similarity-based cache of generated answers.
+    
+    Attributes:
+        embed_fn (Callable): Function mapping a question to an embedding
+        threshold (float): Minimum cosine similarity for a cache hit
+        index_path (str): Path to save/load the FAISS index
+        db_path (str): Path to the SQLite answer store
+    """
+    
+    def __init__(
+        self,
+        embed_fn: Callable[[str], np.ndarray],
+        threshold: float = 0.92,
+        index_path: str = "data/answer_cache.faiss",
+        db_path: str = "data/answer_cache.db",
+        search_k: int = 8
+    ):
+        """
+        Initialize the answer cache.
+        
+        Args:
+            embed_fn: Embedding function, e.g. EmbeddingGenerator().embed_text
+            threshold: Minimum cosine similarity for a cache hit (0-1)
+            index_path: Path to save/load the FAISS index
+            db_path: Path to the SQLite answer store
+            search_k: Neighbours inspected per lookup (to find a matching mode)
+        """
+        self.embed_fn = embed_fn
+        self.threshold = threshold
+        self.index_path = index_path
+        self.db_path = db_path
+        self.search_k = search_k
+        self._lock = threading.Lock()
+        
+        Path(db_path).parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(db_path, check_same_thread=False)
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS answers ("
+            "id INTEGER PRIMARY KEY, question TEXT, mode TEXT, answer TEXT)"
+        )
+        self.conn.commit()
+        
+        # Created lazily once the embedding dimension is known
+        self.index = None
+        if os.path.exists(index_path):
+            self.index = faiss.read_index(index_path)
+            logger.info(f"✓ Loaded answer cache with {self.index.ntotal} entries")
+    
+    def embed(self, question: str) -> np.ndarray:
+        """
+        Embed a question for lookup/storage.
+        
+        Args:
+            question: Question text
+        
+        Returns:
+            L2-normalized float32 embedding (1 x d)
+        """
+        embedding = np.asarray(self.embed_fn(question), dtype=np.float32).reshape(1, -1)
+        faiss.normalize_L2(embedding)
+        return embedding
+    
+    def lookup(self, embedding: np.ndarray, mode: str) -> Optional[str]:
+        """
+        Find a cached answer for a similar question in the same mode.
+        
+        Args:
+            embedding: Question embedding from embed()
+            mode: Answer mode
+        
+        Returns:
+            Cached answer, or None on a miss
+        """
+        with self._lock:
+            if self.index is None or self.index.ntotal == 0:
+                return None
+            
+            similarities, ids = self.index.search(embedding, self.search_k)
+            
+            for similarity, row_id in zip(similarities[0], ids[0]):
+                if row_id < 0 or similarity < self.threshold:
+                    break
+                row = self.conn.execute(
+                    "SELECT mode, answer FROM answers WHERE id = ?",
+                    (int(row_id),)
+                ).fetchone()
+                if row and row[0] == mode:
+                    logger.info(f"Answer cache hit (similarity={similarity:.3f})")
+                    return row[1]
+        
+        return None
+    
+    def put(self, embedding: np.ndarray, question: str, mode: str, answer: str) -> None:
+        """
+        Store an answer in the cache.
+        
+        Args:
+            embedding: Question embedding from embed()
+            question: Question text
+            mode: Answer mode
+            answer: Generated answer
+        """
+        with self._lock:
+            cursor = self.conn.execute(
+                "INSERT INTO answers (question, mode, answer) VALUES (?, ?, ?)",
+                (question, mode, answer)
+            )
+            self.conn.commit()
+            
+            if self.index is None:
+                self.index = faiss.IndexIDMap(faiss.IndexFlatIP(embedding.shape[1]))
+            self.index.add_with_ids(embedding, np.array([cursor.lastrowid], dtype=np.int64))
+    
+    def save(self) -> bool:
+        """
+        Save the FAISS index to disk (answers are already in SQLite).
+        
+        Returns:
+            True if successful, False otherwise
+        """
+        try:
+            with self._lock:
+                if self.index is None:
+                    return True
+                Path(self.index_path).parent.mkdir(parents=True, exist_ok=True)
+                faiss.write_index(self.index, self.index_path)
+            logger.info(f"✓ Saved answer cache to {self.index_path}")
+            return True
+        except Exception as e:
+            logger.error(f"Failed to save answer cache: {e}")
+            return False
+    
+    def __len__(self) -> int:
+        """Number of cached answers."""
+        return 0 if self.index is None else self.index.ntotal
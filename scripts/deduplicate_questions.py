@@ -10,12 +10,18 @@ This script:
 - Provides analysis of duplicates found
 """
 
+import hashlib
 import json
 import os
 from pathlib import Path
 from collections import defaultdict
 from typing import List, Dict, Tuple
 
+try:
+    import orjson  # Optional: several times faster than json for large files
+except ImportError:
+    orjson = None
+
 # Get project root directory
 script_dir = os.path.dirname(os.path.abspath(__file__))
 project_root = os.path.dirname(script_dir)
@@ -26,29 +32,62 @@ REPORT_FILE = os.path.join(project_root, "data", "deduplication_report.json")
 
 def load_questions(json_file: str) -> List[Dict]:
     """Load questions from JSON file."""
+    if orjson is not None:
+        with open(json_file, 'rb') as f:
+            return orjson.loads(f.read())
+    
     with open(json_file, 'r', encoding='utf-8') as f:
         return json.load(f)
 
 
-def find_duplicates(questions: List[Dict]) -> Dict[str, List[int]]:
+def save_json(data, json_file: str) -> None:
+    """Write data as indented UTF-8 JSON."""
+    if orjson is not None:
+        with open(json_file, 'wb') as f:
+            f.write(orjson.dumps(data, option=orjson.OPT_INDENT_2))
+        return
+    
+    with open(json_file, 'w', encoding='utf-8') as f:
+        json.dump(data, f, indent=2, ensure_ascii=False)
+
+
+def _text_key(text: str) -> int:
+    """64-bit hash of question text, used to group candidate duplicates."""
+    return int.from_bytes(hashlib.blake2b(text.encode('utf-8'), digest_size=8).digest(), 'little')
+
+
+def find_duplicates(questions: List[Dict]) -> List[List[int]]:
     """
     Find exact duplicate questions by comparing question text.
     
+    Questions are grouped on an 8-byte hash of their text; only groups
+    with more than one member are compared by actual text, so hash
+    collisions never merge different questions.
+    
     Returns:
-        Dict mapping question text to list of indices in original data
+        List of index groups (indices in original data), one per duplicated text
     """
-    question_texts = defaultdict(list)
+    buckets = defaultdict(list)
     for i, q in enumerate(questions):
-        text = q.get('question', '').strip()
-        question_texts[text].append(i)
+        buckets[_text_key(q.get('question', '').strip())].append(i)
+    
+    duplicates = []
+    for indices in buckets.values():
+        if len(indices) < 2:
+            continue
+        
+        # Verify equality within the bucket
+        by_text = defaultdict(list)
+        for i in indices:
+            by_text[questions[i].get('question', '').strip()].append(i)
+        duplicates.extend(group for group in by_text.values() if len(group) > 1)
     
-    # Return only duplicates (len > 1)
-    return {text: indices for text, indices in question_texts.items() if len(indices) > 1}
+    return duplicates
 
 
-def select_canonical_version(questions: List[Dict], indices: List[int]) -> Tuple[int, Dict]:
+def select_canonical_versions(questions: List[Dict], groups: List[List[int]]) -> List[int]:
     """
-    Select the canonical version from duplicate group.
+    Select the canonical version of every duplicate group.
     
     Priority:
     1. Question with known unit code (not "Unknown")
@@ -57,13 +96,10 @@ def select_canonical_version(questions: List[Dict], indices: List[int]) -> Tuple
     4. First in list
     
     Returns:
-        Tuple of (canonical_index, canonical_question)
+        Canonical index for each group, in the same order as groups
     """
-    candidates = [(i, questions[i]) for i in indices]
-    
-    # Sort by priority
-    def priority_key(item):
-        idx, q = item
+    def priority_key(idx):
+        q = questions[idx]
         unit = q.get('unit', 'Unknown')
         year = int(q.get('year', 9999)) if q.get('year') else 9999
         has_metadata = 1 if q.get('metadata') else 0
@@ -75,8 +111,7 @@ def select_canonical_version(questions: List[Dict], indices: List[int]) -> Tuple
             -has_metadata        # Has metadata = -1, no metadata = 0
         )
     
-    canonical_idx, canonical_q = min(candidates, key=priority_key)
-    return canonical_idx, canonical_q
+    return [min(indices, key=priority_key) for indices in groups]
 
 
 def merge_sources(questions: List[Dict], indices: List[int]) -> Dict:
@@ -108,8 +143,8 @@ def merge_sources(questions: List[Dict], indices: List[int]) -> Dict:
         })
     
     return {
-        'source_pdfs': sorted(list(source_files)),
-        'years_found': sorted(list(years)),
+        'source_pdfs': sorted(source_files),
+        'years_found': sorted(years),
         'all_sources': sources,
         'duplicate_count': len(indices)
     }
@@ -124,19 +159,21 @@ def deduplicate_questions(questions: List[Dict]) -> Tuple[List[Dict], Dict]:
     """
     duplicates = find_duplicates(questions)
     
-    # Track which original indices to keep
-    indices_to_keep = set(range(len(questions)))
+    # Indices covered by a duplicate group (canonical or not)
+    grouped_indices = set()
     deduplicated = []
     report = {
         'total_original': len(questions),
         'total_duplicates_found': len(duplicates),
-        'total_duplicate_instances': sum(len(v) - 1 for v in duplicates.values()),
+        'total_duplicate_instances': sum(len(v) - 1 for v in duplicates),
         'duplicate_groups': []
     }
     
+    canonical_indices = select_canonical_versions(questions, duplicates)
+    
     # Process each duplicate group
-    for question_text, indices in duplicates.items():
-        canonical_idx, canonical_q = select_canonical_version(questions, indices)
+    for indices, canonical_idx in zip(duplicates, canonical_indices):
+        canonical_q = questions[canonical_idx]
         
         # Merge source information
         merged_sources = merge_sources(questions, indices)
@@ -155,10 +192,7 @@ def deduplicate_questions(questions: List[Dict]) -> Tuple[List[Dict], Dict]:
         
         deduplicated.append(enhanced_q)
         
-        # Mark non-canonical indices for removal
-        for idx in indices:
-            if idx != canonical_idx:
-                indices_to_keep.discard(idx)
+        grouped_indices.update(indices)
         
         # Add to report
         report['duplicate_groups'].append({
@@ -170,13 +204,14 @@ def deduplicate_questions(questions: List[Dict]) -> Tuple[List[Dict], Dict]:
         })
     
     # Add non-duplicate questions
-    for i in sorted(indices_to_keep):
-        if i not in [group['canonical_index'] for group in report['duplicate_groups']]:
-            q = questions[i].copy()
-            if 'metadata' not in q:
-                q['metadata'] = {}
-            q['metadata']['is_deduplicated'] = False
-            deduplicated.append(q)
+    for i, question in enumerate(questions):
+        if i in grouped_indices:
+            continue
+        q = question.copy()
+        if 'metadata' not in q:
+            q['metadata'] = {}
+        q['metadata']['is_deduplicated'] = False
+        deduplicated.append(q)
     
     report['total_after_deduplication'] = len(deduplicated)
     report['questions_removed'] = report['total_original'] - report['total_after_deduplication']
@@ -220,14 +255,12 @@ def main():
     
     # Save deduplicated questions
     print(f"\nSaving deduplicated questions to {OUTPUT_FILE}...")
-    with open(OUTPUT_FILE, 'w', encoding='utf-8') as f:
-        json.dump(deduplicated, f, indent=2, ensure_ascii=False)
+    save_json(deduplicated, OUTPUT_FILE)
     print(f"✓ Saved {len(deduplicated)} deduplicated questions")
     
     # Save report
     print(f"\nSaving report to {REPORT_FILE}...")
-    with open(REPORT_FILE, 'w', encoding='utf-8') as f:
-        json.dump(report, f, indent=2, ensure_ascii=False)
+    save_json(report, REPORT_FILE)
     print(f"✓ Report saved")
     
     print("\n" + "=" * 70)
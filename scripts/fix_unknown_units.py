@@ -9,80 +9,283 @@ This script provides tools to:
 """
 
 import json
+import mmap
 import os
+import re
+import sys
 from pathlib import Path
-from collections import defaultdict
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Optional
+
+try:
+    import ijson  # Optional: stream the dataset instead of loading it whole
+except ImportError:
+    ijson = None
+
+try:
+    import orjson  # Optional: several times faster than json for large files
+except ImportError:
+    orjson = None
 
 # Get project root directory
 script_dir = os.path.dirname(os.path.abspath(__file__))
 project_root = os.path.dirname(script_dir)
 INPUT_FILE = os.path.join(project_root, "data", "past_questions_deduplicated.json")
+# One question per line; created from INPUT_FILE by the 'jsonl' command
+INPUT_JSONL = os.path.join(project_root, "data", "past_questions_deduplicated.jsonl")
 UNKNOWN_EXPORT = os.path.join(project_root, "data", "unknown_units_for_review.json")
 UNIT_MAPPING = os.path.join(project_root, "data", "unit_code_mapping.json")
 OUTPUT_FILE = os.path.join(project_root, "data", "past_questions_fixed.json")
 
+# Buffer size for files read or written piece by piece (1 MiB instead of
+# the 8 KiB default, so far fewer read/write system calls)
+IO_BUFFER_SIZE = 1 << 20
 
-def export_unknown_units():
-    """Export all Unknown unit questions for manual review."""
-    with open(INPUT_FILE, 'r', encoding='utf-8') as f:
-        questions = json.load(f)
-    
-    unknown_questions = []
-    for i, q in enumerate(questions):
-        if q.get('unit') == 'Unknown':
-            unknown_questions.append({
-                'index': i,
-                'year': q.get('year'),
-                'source_file': q.get('source_file'),
-                'question_number': q.get('question_number'),
-                'course': q.get('course'),
-                'question_preview': q.get('question', '')[:200] + '...',
-                'full_question': q.get('question'),
-                'current_unit': 'Unknown',
-                'suggested_unit': 'ENTER_UNIT_CODE_HERE'
-            })
-    
-    # Group by source file for easier review
-    by_source = defaultdict(list)
-    for q in unknown_questions:
-        by_source[q['source_file']].append(q)
-    
-    export_data = {
-        'total_unknown': len(unknown_questions),
-        'by_source_file': dict(by_source),
-        'instructions': [
-            '1. Review each question and identify the correct unit code',
-            '2. Replace "ENTER_UNIT_CODE_HERE" with the actual unit code',
-            '3. Save this file and run: python3 apply_unit_fixes.py',
-            '4. The script will update the main dataset'
-        ]
+# Instructions included in the review export
+EXPORT_INSTRUCTIONS = [
+    '1. Review each question and identify the correct unit code',
+    '2. Replace "ENTER_UNIT_CODE_HERE" with the actual unit code',
+    '3. Save this file and run: python3 apply_unit_fixes.py',
+    '4. The script will update the main dataset'
+]
+
+# A "unit": "..." pair in the raw bytes of a JSONL dataset
+UNIT_PATTERN = re.compile(rb'"unit"\s*:\s*"((?:[^"\\]|\\.)*)"')
+
+# JSONL datasets with more questions than this build the mapping template
+# in worker processes (below it, process startup costs more than it saves)
+PARALLEL_MIN_QUESTIONS = 100_000
+
+# Fields whose few distinct values repeat across the whole dataset
+INTERNED_FIELDS = ('unit', 'source_file')
+
+
+@dataclass(slots=True)
+class UnknownEntry:
+    """An Unknown unit question kept for the review export and mapping template."""
+    index: int  # Position in the dataset
+    source_file: Optional[str]
+    year: Any
+    question_number: Any
+    course: Any
+    question: Optional[str]
+
+
+def load_json(path):
+    """
+    Load a JSON file.
+    
+    With orjson the file is memory-mapped and parsed straight from the
+    page cache, without first copying it into a bytes object.
+    """
+    with open(path, 'rb') as f:
+        if orjson is None:
+            return json.load(f)
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            with memoryview(mm) as view:
+                return orjson.loads(view)
+
+
+def dump_json(data, indent=True) -> bytes:
+    """Serialize data as UTF-8 JSON, indented or compact."""
+    if orjson is not None:
+        option = orjson.OPT_NON_STR_KEYS
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(data, option=option)
+    if indent:
+        return json.dumps(data, indent=2, ensure_ascii=False).encode('utf-8')
+    return json.dumps(data, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+
+def save_json(data, path) -> None:
+    """Write data as indented UTF-8 JSON."""
+    with open(path, 'wb') as f:
+        f.write(dump_json(data))
+
+
+def dataset_path():
+    """
+    Get the dataset file to read.
+    
+    The JSONL copy is used when it exists and is not older than
+    INPUT_FILE; otherwise INPUT_FILE itself.
+    """
+    if (os.path.exists(INPUT_JSONL)
+            and os.path.getmtime(INPUT_JSONL) >= os.path.getmtime(INPUT_FILE)):
+        return INPUT_JSONL
+    return INPUT_FILE
+
+
+def iter_questions(path=None):
+    """
+    Yield the questions of the dataset one at a time.
+    
+    Unit codes and source file names are interned, so equal values share
+    one string object and grouping/counting by them compares pointers.
+    """
+    for q in read_questions(path or dataset_path()):
+        for field in INTERNED_FIELDS:
+            value = q.get(field)
+            if isinstance(value, str):
+                q[field] = sys.intern(value)
+        yield q
+
+
+def read_questions(path):
+    """
+    Parse the questions of a dataset file one at a time.
+    
+    JSONL files are read line by line. JSON arrays are parsed
+    incrementally with ijson if installed, so the whole list is never
+    held in memory; otherwise the file is loaded at once.
+    """
+    if path.endswith('.jsonl'):
+        loads = orjson.loads if orjson is not None else json.loads
+        with open(path, 'rb', buffering=IO_BUFFER_SIZE) as f:
+            for line in f:
+                if line.strip():
+                    yield loads(line)
+        return
+    
+    if ijson is None:
+        yield from load_json(path)
+        return
+    
+    with open(path, 'rb', buffering=IO_BUFFER_SIZE) as f:
+        yield from ijson.items(f, 'item', use_float=True, buf_size=IO_BUFFER_SIZE)
+
+
+def write_questions(questions, path, indent=False):
+    """
+    Write questions as a JSON array, one question at a time.
+    
+    The output is compact unless indent is set: the fixed dataset is read
+    by programs, so indentation only adds bytes to write and parse.
+    """
+    with open(path, 'wb', buffering=IO_BUFFER_SIZE) as f:
+        f.write(b'[')
+        count = 0
+        for q in questions:
+            item = dump_json(q, indent)
+            if indent:
+                item = b'\n  ' + item.replace(b'\n', b'\n  ')
+            f.write(b',' + item if count else item)
+            count += 1
+        f.write(b'\n]' if indent and count else b']')
+
+
+def json_to_jsonl():
+    """Convert the dataset to JSONL (one question per line) for faster streaming."""
+    count = 0
+    with open(INPUT_JSONL, 'wb', buffering=IO_BUFFER_SIZE) as f:
+        for q in read_questions(INPUT_FILE):
+            if orjson is not None:
+                f.write(orjson.dumps(q) + b'\n')
+            else:
+                f.write(json.dumps(q, ensure_ascii=False).encode('utf-8') + b'\n')
+            count += 1
+    
+    print(f"✓ Wrote {count} questions to {INPUT_JSONL}")
+    print("  The other commands read it while it is newer than the JSON file")
+
+
+def scan_dataset():
+    """
+    Collect what the export, template and stats commands need in one pass.
+    
+    Unknown questions are kept as slotted UnknownEntry records (no
+    per-instance __dict__) rather than one dict per question.
+    
+    Returns:
+        Dictionary with 'total' (number of questions), 'unknown' (list of
+        UnknownEntry in dataset order) and 'units' (question count per
+        known unit)
+    """
+    total = 0
+    unknown = []
+    units = Counter()
+    for i, q in enumerate(iter_questions()):
+        total += 1
+        unit = q.get('unit', 'Unknown')
+        if unit == 'Unknown':
+            unknown.append(UnknownEntry(
+                i,
+                q.get('source_file'),
+                q.get('year'),
+                q.get('question_number'),
+                q.get('course'),
+                q.get('question')
+            ))
+        else:
+            units[unit] += 1
+    
+    return {'total': total, 'unknown': unknown, 'units': units}
+
+
+def export_entry(entry):
+    """Build the review export item for an UnknownEntry."""
+    return {
+        'index': entry.index,
+        'year': entry.year,
+        'source_file': entry.source_file,
+        'question_number': entry.question_number,
+        'course': entry.course,
+        'full_question': entry.question,
+        'current_unit': 'Unknown',
+        'suggested_unit': 'ENTER_UNIT_CODE_HERE'
     }
+
+
+def write_unknown_export(unknown):
+    """
+    Write the Unknown unit questions for manual review, grouped by source file.
+    
+    Only the output side is streamed: the indented JSON document is written
+    entry by entry, so the nested export dict (one review item per question)
+    is never built. The UnknownEntry records and their grouping by source
+    file are still held in memory, since grouping needs every entry before
+    the first group can be written.
+    """
+    groups = {}
+    for entry in unknown:
+        groups.setdefault(entry.source_file, []).append(entry)
     
-    with open(UNKNOWN_EXPORT, 'w', encoding='utf-8') as f:
-        json.dump(export_data, f, indent=2, ensure_ascii=False)
+    with open(UNKNOWN_EXPORT, 'wb', buffering=IO_BUFFER_SIZE) as f:
+        f.write(b'{\n  "total_unknown": ' + dump_json(len(unknown)))
+        f.write(b',\n  "by_source_file": {')
+        for n, (source, entries) in enumerate(groups.items()):
+            # JSON object keys are strings (a missing source becomes "null")
+            key = source if isinstance(source, str) else json.dumps(source)
+            f.write((b',\n    ' if n else b'\n    ') + dump_json(key) + b': [')
+            for m, entry in enumerate(entries):
+                item = dump_json(export_entry(entry)).replace(b'\n', b'\n      ')
+                f.write((b',\n      ' if m else b'\n      ') + item)
+            f.write(b'\n    ]')
+        f.write(b'\n  }' if groups else b'}')
+        f.write(b',\n  "instructions": ' + dump_json(EXPORT_INSTRUCTIONS).replace(b'\n', b'\n  '))
+        f.write(b'\n}')
     
-    print(f"✓ Exported {len(unknown_questions)} Unknown unit questions to {UNKNOWN_EXPORT}")
+    print(f"✓ Exported {len(unknown)} Unknown unit questions to {UNKNOWN_EXPORT}")
     print(f"\nGrouped by source file:")
-    for source, items in sorted(by_source.items(), key=lambda x: len(x[1]), reverse=True):
-        print(f"  {source}: {len(items)} questions")
+    for source, count in Counter(entry.source_file for entry in unknown).most_common():
+        print(f"  {source}: {count} questions")
 
 
-def create_mapping_template():
-    """Create a template mapping file for unit code corrections."""
-    with open(INPUT_FILE, 'r', encoding='utf-8') as f:
-        questions = json.load(f)
-    
+def write_mapping_template(unknown):
+    """Write a template mapping each Unknown question index to a unit code."""
     # Group Unknown units by source file
-    by_source = defaultdict(list)
-    for i, q in enumerate(questions):
-        if q.get('unit') == 'Unknown':
-            by_source[q.get('source_file')].append({
-                'index': i,
-                'year': q.get('year'),
-                'question_number': q.get('question_number')
-            })
-    
-    # Create mapping template
+    mappings = {}
+    for entry in unknown:
+        mappings.setdefault(entry.source_file, {})[str(entry.index)] = None
+    
+    save_mapping_template(mappings, len(unknown))
+
+
+def save_mapping_template(mappings, unknown_count):
+    """Save the mapping template for {source_file: {index: None}} mappings."""
     mapping = {
         'instructions': [
             'This file maps question indices to their correct unit codes',
@@ -90,95 +293,245 @@ def create_mapping_template():
             'Example: "42": "BBIT106"',
             'Leave as null if unit code is unknown'
         ],
-        'mappings': {}
+        'mappings': mappings
     }
     
-    for source, items in by_source.items():
-        mapping['mappings'][source] = {}
-        for item in items:
-            mapping['mappings'][source][str(item['index'])] = None
-    
-    with open(UNIT_MAPPING, 'w', encoding='utf-8') as f:
-        json.dump(mapping, f, indent=2, ensure_ascii=False)
+    save_json(mapping, UNIT_MAPPING)
     
     print(f"✓ Created mapping template at {UNIT_MAPPING}")
-    print(f"  Total Unknown units to map: {sum(len(v) for v in mapping['mappings'].values())}")
+    print(f"  Total Unknown units to map: {unknown_count}")
 
 
-def apply_unit_fixes(mapping_file=UNIT_MAPPING):
-    """Apply unit code fixes from mapping file."""
-    if not os.path.exists(mapping_file):
-        print(f"❌ Mapping file not found: {mapping_file}")
-        return False
+def unknown_indices_in_chunk(path, start, end):
+    """
+    Group the Unknown unit questions in a byte range of a JSONL file.
     
-    with open(INPUT_FILE, 'r', encoding='utf-8') as f:
-        questions = json.load(f)
+    Runs in a worker process. The range must start and end at line
+    boundaries.
     
-    with open(mapping_file, 'r', encoding='utf-8') as f:
-        mapping_data = json.load(f)
+    Returns:
+        Tuple of (number of questions in the range, {source_file: [index
+        within the range]})
+    """
+    loads = orjson.loads if orjson is not None else json.loads
+    count = 0
+    groups = {}
+    with open(path, 'rb') as f:
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            lines = mm[start:end].split(b'\n')
     
-    mappings = mapping_data.get('mappings', {})
-    fixed_count = 0
+    for line in lines:
+        if not line.strip():
+            continue
+        q = loads(line)
+        if q.get('unit', 'Unknown') == 'Unknown':
+            groups.setdefault(q.get('source_file'), []).append(count)
+        count += 1
     
-    # Apply fixes
-    for source, index_mapping in mappings.items():
-        for index_str, unit_code in index_mapping.items():
-            if unit_code is not None:
-                index = int(index_str)
-                if index < len(questions):
-                    old_unit = questions[index].get('unit')
-                    questions[index]['unit'] = unit_code
-                    fixed_count += 1
-                    print(f"  Fixed index {index}: {old_unit} → {unit_code}")
+    return count, groups
+
+
+def parallel_unknown_mappings(path, workers=None):
+    """
+    Build the mapping template mappings of a JSONL dataset in worker processes.
     
-    # Save fixed dataset
-    with open(OUTPUT_FILE, 'w', encoding='utf-8') as f:
-        json.dump(questions, f, indent=2, ensure_ascii=False)
+    The file is split into one contiguous, line-aligned byte range per
+    worker. Partial results are merged in file order, so indices and the
+    order of source files match a sequential pass.
     
-    print(f"\n✓ Fixed {fixed_count} unit codes")
-    print(f"✓ Saved to {OUTPUT_FILE}")
+    Returns:
+        Tuple of ({source_file: {index: None}}, number of Unknown questions)
+    """
+    workers = workers or os.cpu_count() or 1
+    with open(path, 'rb') as f:
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            size = len(mm)
+            bounds = [0]
+            for n in range(1, workers):
+                newline = mm.find(b'\n', max(size * n // workers, bounds[-1]))
+                bounds.append(size if newline == -1 else newline + 1)
+            bounds.append(size)
     
-    return True
+    mappings = {}
+    unknown_count = 0
+    offset = 0
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        for count, groups in pool.map(
+            unknown_indices_in_chunk, [path] * workers, bounds[:-1], bounds[1:]
+        ):
+            for source, indices in groups.items():
+                mappings.setdefault(source, {}).update(
+                    (str(offset + i), None) for i in indices
+                )
+                unknown_count += len(indices)
+            offset += count
+    
+    return mappings, unknown_count
 
 
-def show_statistics():
-    """Show current statistics."""
-    with open(INPUT_FILE, 'r', encoding='utf-8') as f:
-        questions = json.load(f)
+def count_lines(path):
+    """Count the lines of a file without parsing it."""
+    count = 0
+    with open(path, 'rb') as f:
+        while block := f.read(IO_BUFFER_SIZE):
+            count += block.count(b'\n')
+    return count
+
+
+def count_units(path=None):
+    """
+    Count questions per unit code.
+    
+    A JSONL dataset is first scanned as raw bytes: the file is
+    memory-mapped and only "unit" values are matched, so no JSON is parsed
+    and no question dicts are built. The scan is used only if it found
+    exactly one unit per question (line); otherwise (a question without a
+    string "unit", or a nested object using that key) and for JSON arrays
+    the questions are parsed.
+    
+    Returns:
+        Tuple of (number of questions, Counter of unit code -> number of
+        questions in first-seen order, missing units counted as 'Unknown')
+    """
+    path = path or dataset_path()
     
-    unknown_count = sum(1 for q in questions if q.get('unit') == 'Unknown')
-    known_count = len(questions) - unknown_count
+    if path.endswith('.jsonl') and os.path.getsize(path):
+        with open(path, 'rb') as f:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                raw_counts = Counter(UNIT_PATTERN.findall(mm))
+        with open(path, 'rb', buffering=IO_BUFFER_SIZE) as f:
+            total = sum(1 for line in f if line.strip())
+        
+        if sum(raw_counts.values()) == total:
+            # Decode each distinct value once (handles escapes in the JSON string)
+            units = Counter()
+            for raw_unit, count in raw_counts.items():
+                units[json.loads(b'"' + raw_unit + b'"')] += count
+            return total, units
+    
+    units = Counter(q.get('unit', 'Unknown') for q in iter_questions(path))
+    return sum(units.values()), units
+
+
+def print_statistics(total, unknown_count, units):
+    """
+    Print unit code statistics.
+    
+    Args:
+        total: Number of questions
+        unknown_count: Number of questions with an Unknown unit
+        units: Counter of question count per known unit
+    """
+    known_count = total - unknown_count
     
     print("\n" + "=" * 60)
     print("UNIT CODE STATISTICS")
     print("=" * 60)
-    print(f"Total questions: {len(questions)}")
-    print(f"Known unit codes: {known_count} ({known_count/len(questions)*100:.1f}%)")
-    print(f"Unknown unit codes: {unknown_count} ({unknown_count/len(questions)*100:.1f}%)")
+    print(f"Total questions: {total}")
+    print(f"Known unit codes: {known_count} ({known_count/total*100:.1f}%)")
+    print(f"Unknown unit codes: {unknown_count} ({unknown_count/total*100:.1f}%)")
     
     # Show known units
-    units = defaultdict(int)
-    for q in questions:
-        unit = q.get('unit', 'Unknown')
-        if unit != 'Unknown':
-            units[unit] += 1
-    
     print(f"\nKnown units:")
-    for unit, count in sorted(units.items(), key=lambda x: x[1], reverse=True):
+    for unit, count in units.most_common():
         print(f"  {unit}: {count}")
 
 
+def export_unknown_units():
+    """Export all Unknown unit questions for manual review."""
+    write_unknown_export(scan_dataset()['unknown'])
+
+
+def create_mapping_template():
+    """
+    Create a template mapping file for unit code corrections.
+    
+    Large JSONL datasets are split across worker processes; a JSON array
+    cannot be split without parsing it, so it is always read in one pass.
+    """
+    path = dataset_path()
+    if path.endswith('.jsonl') and count_lines(path) > PARALLEL_MIN_QUESTIONS:
+        save_mapping_template(*parallel_unknown_mappings(path))
+    else:
+        write_mapping_template(scan_dataset()['unknown'])
+
+
+def apply_unit_fixes(mapping_file=UNIT_MAPPING, verbose=False, pretty=False):
+    """
+    Apply unit code fixes from mapping file.
+    
+    Args:
+        mapping_file: Mapping file created by the template command
+        verbose: Print every fixed index, not just the total
+        pretty: Indent the fixed dataset (compact by default)
+    """
+    if not os.path.exists(mapping_file):
+        print(f"❌ Mapping file not found: {mapping_file}")
+        return False
+    
+    mapping_data = load_json(mapping_file)
+    
+    # Flatten the mapping to index -> unit code, then stream the dataset through
+    fixes = {
+        int(index_str): unit_code
+        for index_mapping in mapping_data.get('mappings', {}).values()
+        for index_str, unit_code in index_mapping.items()
+        if unit_code is not None
+    }
+    
+    fixed = []  # (index, old unit, new unit)
+    
+    def fixed_questions():
+        for index, q in enumerate(iter_questions()):
+            unit_code = fixes.get(index)
+            if unit_code is not None:
+                fixed.append((index, q.get('unit'), unit_code))
+                q['unit'] = unit_code
+            yield q
+    
+    # Save fixed dataset
+    write_questions(fixed_questions(), OUTPUT_FILE, indent=pretty)
+    
+    if verbose:
+        # One write for all lines instead of a print() per fix
+        sys.stdout.write(''.join(
+            f"  Fixed index {index}: {old_unit} → {unit_code}\n"
+            for index, old_unit, unit_code in fixed
+        ))
+    
+    print(f"\n✓ Fixed {len(fixed)} unit codes")
+    print(f"✓ Saved to {OUTPUT_FILE}")
+    
+    return True
+
+
+def show_statistics():
+    """Show current statistics."""
+    total, units = count_units()
+    unknown_count = units.pop('Unknown', 0)
+    print_statistics(total, unknown_count, units)
+
+
+def rebuild_all():
+    """Write the export and mapping template and show statistics from a single pass."""
+    scan = scan_dataset()
+    write_unknown_export(scan['unknown'])
+    write_mapping_template(scan['unknown'])
+    print_statistics(scan['total'], len(scan['unknown']), scan['units'])
+
+
 def main():
     """Main workflow."""
-    import sys
-    
     if len(sys.argv) < 2:
         print("Usage: python3 fix_unknown_units.py <command>")
         print("\nCommands:")
         print("  export     - Export Unknown units for manual review")
         print("  template   - Create mapping template")
-        print("  apply      - Apply fixes from mapping file")
+        print("  apply      - Apply fixes from mapping file (--verbose lists each fix,")
+        print("               --pretty indents the output)")
         print("  stats      - Show current statistics")
+        print("  rebuild    - Export, template and stats in one pass")
+        print("  jsonl      - Convert the dataset to JSONL for faster reads")
         print("\nWorkflow:")
         print("  1. python3 fix_unknown_units.py export")
         print("  2. Review and manually fill in unit codes")
@@ -192,9 +545,16 @@ def main():
     elif command == "template":
         create_mapping_template()
     elif command == "apply":
-        apply_unit_fixes()
+        apply_unit_fixes(
+            verbose="--verbose" in sys.argv[2:],
+            pretty="--pretty" in sys.argv[2:]
+        )
     elif command == "stats":
         show_statistics()
+    elif command == "rebuild":
+        rebuild_all()
+    elif command == "jsonl":
+        json_to_jsonl()
     else:
         print(f"Unknown command: {command}")
 
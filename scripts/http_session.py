@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+Pooled HTTP Sessions for the LLM Server Clients.
+
+This module holds the connection handling shared by OllamaClient and
+VLLMClient:
+- A keep-alive connection pool, so concurrent and repeated calls reuse
+  TCP connections
+- Retries with exponential backoff for busy/overloaded servers
+- close() and a default warm_up()
+"""
+
+from abc import ABC, abstractmethod
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+# Retry busy/overloaded responses (429, 503) with exponential backoff.
+# Connection and read errors are not retried: a stopped server fails fast,
+# and a generation that timed out is not submitted a second time.
+RETRY = Retry(
+    total=3,
+    connect=0,
+    read=0,
+    status=3,
+    backoff_factor=0.5,
+    status_forcelist=(429, 503),
+    allowed_methods=None,
+    raise_on_status=False
+)
+
+
+def create_session(pool_maxsize: int = 32) -> requests.Session:
+    """
+    Create a requests session with a keep-alive connection pool and RETRY.
+    
+    Args:
+        pool_maxsize: Maximum connections kept open per host
+    
+    Returns:
+        Configured requests.Session
+    """
+    session = requests.Session()
+    adapter = HTTPAdapter(
+        pool_connections=4,
+        pool_maxsize=pool_maxsize,
+        max_retries=RETRY
+    )
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+class PooledHTTPClient(ABC):
+    """
+    Base class for LLM server clients sharing one pooled session.
+    
+    Subclasses implement check_connection() and the model calls.
+    
+    Attributes:
+        base_url (str): Server URL
+        model (str): Model name
+        timeout (int): Request timeout in seconds
+        session (requests.Session): Pooled session used for all requests
+    """
+    
+    def __init__(self, base_url: str, model: str, timeout: int):
+        """
+        Initialize the client and its session.
+        
+        Args:
+            base_url: Server URL
+            model: Model name to use
+            timeout: Request timeout in seconds
+        """
+        self.base_url = base_url
+        self.model = model
+        self.timeout = timeout
+        self.session = create_session()
+    
+    @abstractmethod
+    def check_connection(self) -> bool:
+        """Check if the server is running and accessible."""
+    
+    def warm_up(self) -> bool:
+        """
+        Prepare the server for the first request.
+        
+        By default only checks the connection; servers that load the model
+        lazily override this.
+        
+        Returns:
+            True if the server is ready, False otherwise
+        """
+        return self.check_connection()
+    
+    def close(self) -> None:
+        """Close pooled HTTP connections."""
+        self.session.close()
@@ -12,8 +12,9 @@ This script:
 import json
 import os
 from pathlib import Path
-from typing import List, Dict, Optional, Set
-from collections import defaultdict
+from types import MappingProxyType
+from typing import List, Dict, Optional, Set, Mapping
+from collections import defaultdict, Counter
 
 # Get project root directory
 script_dir = os.path.dirname(os.path.abspath(__file__))
@@ -32,6 +33,13 @@ class QuestionLoader:
         """Initialize loader with questions from JSON file."""
         self.json_file = json_file
         self.questions: List[Dict] = []
+        self._by_unit: Dict[str, List[Dict]] = {}
+        self._by_year: Dict[str, List[Dict]] = {}
+        self._unit_counts: Counter = Counter()
+        self._year_counts: Counter = Counter()
+        self._sorted_units: tuple = ()
+        self._sorted_years: tuple = ()
+        self.loaded_version = ""
         self.load_questions()
     
     def load_questions(self) -> None:
@@ -39,11 +47,66 @@ class QuestionLoader:
         if not os.path.exists(self.json_file):
             raise FileNotFoundError(f"Questions file not found: {self.json_file}")
         
+        version = self.get_file_version()
         with open(self.json_file, 'r', encoding='utf-8') as f:
             self.questions = json.load(f)
         
         print(f"✓ Loaded {len(self.questions)} questions from {self.json_file}")
         self._validate_questions()
+        self._build_indexes()
+        self.loaded_version = version
+    
+    def get_file_version(self) -> str:
+        """Identify the current contents of the JSON file by its mtime and size."""
+        return get_file_version(self.json_file)
+    
+    def reload_if_changed(self) -> bool:
+        """
+        Reload the questions if the JSON file changed since it was loaded.
+        
+        Returns:
+            True if the questions were reloaded, False otherwise
+        """
+        if self.get_file_version() == self.loaded_version:
+            return False
+        self.load_questions()
+        return True
+    
+    def _build_indexes(self) -> None:
+        """
+        Index questions by unit and year in a single pass.
+        
+        Unit keys are upper-cased so lookups are case-insensitive. The
+        counters keep the original names and back the unique/statistics
+        methods.
+        """
+        by_unit = defaultdict(list)
+        by_year = defaultdict(list)
+        unit_counts = Counter()
+        year_counts = Counter()
+        
+        for q in self.questions:
+            by_unit[q.get("unit", "").upper()].append(q)
+            by_year[str(q.get("year", ""))].append(q)
+            unit_counts[q.get("unit", "Unknown")] += 1
+            year_counts[str(q.get("year", "Unknown"))] += 1
+        
+        self._by_unit = dict(by_unit)
+        self._by_year = dict(by_year)
+        self._unit_counts = unit_counts
+        self._year_counts = year_counts
+        self._sorted_units = tuple(sorted(self._unit_counts))
+        self._sorted_years = tuple(sorted(self._year_counts))
+    
+    @property
+    def unit_index(self) -> Mapping[str, List[Dict]]:
+        """Read-only mapping of upper-cased unit code to its questions."""
+        return MappingProxyType(self._by_unit)
+    
+    @property
+    def year_index(self) -> Mapping[str, List[Dict]]:
+        """Read-only mapping of year to its questions."""
+        return MappingProxyType(self._by_year)
     
     def _validate_questions(self) -> None:
         """Validate that all questions have required fields."""
@@ -67,11 +130,11 @@ class QuestionLoader:
     
     def filter_by_unit(self, unit: str) -> List[Dict]:
         """Filter questions by unit code."""
-        return [q for q in self.questions if q.get("unit", "").upper() == unit.upper()]
+        return list(self._by_unit.get(unit.upper(), ()))
     
     def filter_by_year(self, year: str) -> List[Dict]:
         """Filter questions by year."""
-        return [q for q in self.questions if str(q.get("year", "")) == str(year)]
+        return list(self._by_year.get(str(year), ()))
     
     def filter_by_course(self, course: str) -> List[Dict]:
         """Filter questions by course."""
@@ -84,7 +147,7 @@ class QuestionLoader:
         filtered = self.questions
         
         if unit:
-            filtered = [q for q in filtered if q.get("unit", "").upper() == unit.upper()]
+            filtered = self.filter_by_unit(unit)
         if year:
             filtered = [q for q in filtered if str(q.get("year", "")) == str(year)]
         if course:
@@ -94,27 +157,32 @@ class QuestionLoader:
     
     def get_unique_units(self) -> Set[str]:
         """Get set of unique unit codes."""
-        return set(q.get("unit", "Unknown") for q in self.questions)
+        return set(self._unit_counts)
     
     def get_unique_years(self) -> Set[str]:
         """Get set of unique years."""
-        return set(str(q.get("year", "Unknown")) for q in self.questions)
+        return set(self._year_counts)
+    
+    def get_unit_counts(self) -> Dict[str, int]:
+        """Get number of questions per unit (counted once at load)."""
+        return dict(self._unit_counts)
+    
+    def get_sorted_units(self) -> tuple:
+        """Get unique unit codes in sorted order (computed once at load)."""
+        return self._sorted_units
+    
+    def get_sorted_years(self) -> tuple:
+        """Get unique years in sorted order (computed once at load)."""
+        return self._sorted_years
     
     def get_statistics(self) -> Dict:
         """Get statistics about the loaded questions."""
-        units = defaultdict(int)
-        years = defaultdict(int)
-        
-        for q in self.questions:
-            units[q.get("unit", "Unknown")] += 1
-            years[str(q.get("year", "Unknown"))] += 1
-        
         return {
             "total_questions": len(self.questions),
-            "unique_units": len(self.get_unique_units()),
-            "unique_years": len(self.get_unique_years()),
-            "questions_per_unit": dict(units),
-            "questions_per_year": dict(years),
+            "unique_units": len(self._unit_counts),
+            "unique_years": len(self._year_counts),
+            "questions_per_unit": self.get_unit_counts(),
+            "questions_per_year": dict(self._year_counts),
         }
     
     def search_questions(self, keyword: str) -> List[Dict]:
@@ -164,6 +232,16 @@ class QuestionLoader:
         }
 
 
+def get_file_version(json_file: str = DATA_FILE) -> str:
+    """
+    Identify the current contents of a questions file by its mtime and size.
+    
+    Cheap enough to call on every Streamlit rerun, e.g. as a cache key.
+    """
+    stat = os.stat(json_file)
+    return f"{stat.st_mtime_ns}-{stat.st_size}"
+
+
 def load_questions(json_file: str = DATA_FILE) -> QuestionLoader:
     """
     Convenience function to load questions.
@@ -13,15 +13,21 @@ Configuration:
 import requests
 import json
 import os
-from typing import Optional, Dict
+import sys
+from typing import Optional, Dict, Iterator
 import logging
 
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from scripts.http_session import PooledHTTPClient
+
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 
-class OllamaClient:
+class OllamaClient(PooledHTTPClient):
     """
     Client for communicating with Ollama local LLM server.
     
@@ -45,9 +51,7 @@ class OllamaClient:
             model: Model name to use
             timeout: Request timeout in seconds (default 300 for long responses)
         """
-        self.base_url = base_url
-        self.model = model
-        self.timeout = timeout
+        super().__init__(base_url, model, timeout)
         self.endpoint = f"{base_url}/api/generate"
         
         logger.info(f"Initialized OllamaClient: {base_url}, model: {model}")
@@ -58,7 +62,8 @@ class OllamaClient:
         temperature: float = 0.7,
         top_p: float = 0.9,
         top_k: int = 40,
-        num_predict: int = 512
+        num_predict: int = 512,
+        system: Optional[str] = None
     ) -> Optional[str]:
         """
         Send a prompt to the Ollama model and get a response.
@@ -69,6 +74,8 @@ class OllamaClient:
             top_p: Nucleus sampling parameter
             top_k: Top-k sampling parameter
             num_predict: Maximum tokens to generate
+            system: Optional system prompt, sent separately so the server
+                    can reuse its cached KV state for it across requests
         
         Returns:
             Model response as string, or None if request fails
@@ -87,11 +94,13 @@ class OllamaClient:
                 "top_k": top_k,
                 "num_predict": num_predict
             }
+            if system:
+                payload["system"] = system
             
             logger.info(f"Sending prompt to {self.model} (temp={temperature})")
             
             # Send request to Ollama
-            response = requests.post(
+            response = self.session.post(
                 self.endpoint,
                 json=payload,
                 timeout=self.timeout
@@ -122,6 +131,97 @@ class OllamaClient:
             logger.error(f"Unexpected error: {str(e)}")
             return None
     
+    def stream_model(
+        self,
+        prompt: str,
+        temperature: float = 0.7,
+        top_p: float = 0.9,
+        top_k: int = 40,
+        num_predict: int = 512,
+        system: Optional[str] = None
+    ) -> Iterator[str]:
+        """
+        Send a prompt to the Ollama model and yield the response as it is generated.
+        
+        Uses the streaming mode of /api/generate, where each line of the
+        response body is a JSON object holding the next piece of text.
+        
+        Args:
+            prompt: The prompt to send to the model
+            temperature: Sampling temperature (0.0-1.0). Higher = more creative
+            top_p: Nucleus sampling parameter
+            top_k: Top-k sampling parameter
+            num_predict: Maximum tokens to generate
+            system: Optional system prompt, sent separately so the server
+                    can reuse its cached KV state for it across requests
+        
+        Yields:
+            Response text chunks. Nothing more is yielded if the request fails.
+        """
+        payload = {
+            "model": self.model,
+            "prompt": prompt,
+            "stream": True,
+            "temperature": temperature,
+            "top_p": top_p,
+            "top_k": top_k,
+            "num_predict": num_predict
+        }
+        if system:
+            payload["system"] = system
+        
+        logger.info(f"Streaming prompt to {self.model} (temp={temperature})")
+        
+        try:
+            with self.session.post(
+                self.endpoint,
+                json=payload,
+                timeout=self.timeout,
+                stream=True
+            ) as response:
+                if response.status_code != 200:
+                    logger.error(f"Ollama error: {response.status_code} - {response.text}")
+                    return
+                
+                for line in response.iter_lines():
+                    if not line:
+                        continue
+                    chunk = json.loads(line)
+                    text = chunk.get("response", "")
+                    if text:
+                        yield text
+                    if chunk.get("done"):
+                        break
+        
+        except requests.exceptions.ConnectionError:
+            logger.error("Failed to connect to Ollama server. Is it running?")
+        except requests.exceptions.Timeout:
+            logger.error(f"Request timeout after {self.timeout} seconds")
+        except json.JSONDecodeError:
+            logger.error("Failed to parse Ollama response")
+    
+    def warm_up(self) -> bool:
+        """
+        Ask the server to load the model into memory without generating.
+        
+        Ollama loads a model on its first request, which can take several
+        seconds. Calling this while other work runs (e.g. retrieval) takes
+        the load off the answer's critical path.
+        
+        Returns:
+            True if the model is loaded, False otherwise
+        """
+        try:
+            response = self.session.post(
+                self.endpoint,
+                json={"model": self.model},
+                timeout=self.timeout
+            )
+            return response.status_code == 200
+        except Exception as e:
+            logger.warning(f"Model warm-up failed: {str(e)}")
+            return False
+    
     def check_connection(self) -> bool:
         """
         Check if Ollama server is running and accessible.
@@ -130,7 +230,7 @@ class OllamaClient:
             True if connection successful, False otherwise
         """
         try:
-            response = requests.get(
+            response = self.session.get(
                 f"{self.base_url}/api/tags",
                 timeout=5
             )
@@ -152,7 +252,7 @@ class OllamaClient:
             List of model names, or None if request fails
         """
         try:
-            response = requests.get(
+            response = self.session.get(
                 f"{self.base_url}/api/tags",
                 timeout=5
             )
@@ -12,9 +12,13 @@ Each template is designed to guide the LLM to produce answers
 appropriate for KCA University students.
 """
 
-from typing import Dict, Optional
+from functools import lru_cache
+from typing import Dict, Optional, Tuple
 
 
+# Marks the start of the per-question part of each template
+QUESTION_MARKER = "QUESTION:"
+
 # Prompt templates for different modes
 PROMPT_TEMPLATES: Dict[str, str] = {
     "exam": """You are an expert tutor helping a KCA University student prepare for exams.
@@ -80,6 +84,19 @@ ANSWER:"""
 }
 
 
+# Valid modes, fixed at import (set for membership tests, tuple for order)
+_MODES: frozenset = frozenset(PROMPT_TEMPLATES)
+_MODES_LIST: tuple = tuple(PROMPT_TEMPLATES)
+
+# Each template split around its {question} placeholder, so prompts are
+# built by concatenation instead of re-parsing the template with str.format
+# (the templates contain no other braces)
+_PROMPT_PARTS: Dict[str, Tuple[str, str]] = {
+    mode: tuple(template.split("{question}", 1))
+    for mode, template in PROMPT_TEMPLATES.items()
+}
+
+
 def get_prompt_template(mode: str) -> Optional[str]:
     """
     Get the prompt template for a given mode.
@@ -104,11 +121,64 @@ def format_prompt(question: str, mode: str = "exam") -> Optional[str]:
     Returns:
         Formatted prompt string, or None if mode is invalid
     """
-    template = get_prompt_template(mode)
-    if template is None:
+    parts = _PROMPT_PARTS.get(mode)
+    if parts is None:
         return None
     
-    return template.format(question=question)
+    return parts[0] + question + parts[1]
+
+
+@lru_cache(maxsize=8)
+def _split_template(mode: str) -> Optional[Tuple[str, str, str]]:
+    """
+    Split a template into its fixed instructions and its question part.
+    
+    Returns:
+        Tuple of (instructions, question part before the question, question
+        part after the question), or None if mode is invalid
+    """
+    parts = _PROMPT_PARTS.get(mode)
+    if parts is None:
+        return None
+    
+    instructions, before_question = parts[0].split(QUESTION_MARKER, 1)
+    return instructions.rstrip(), QUESTION_MARKER + before_question, parts[1]
+
+
+def get_system_prompt(mode: str) -> Optional[str]:
+    """
+    Get the fixed instruction part of a mode's prompt.
+    
+    The instructions are identical for every question in a mode, so sending
+    them separately (Ollama's "system" field) or as a shared prefix lets the
+    server reuse its cached KV state instead of re-processing them.
+    
+    Args:
+        mode: Answer mode ('exam', 'local', 'global', 'mixed')
+    
+    Returns:
+        System prompt string, or None if mode is invalid
+    """
+    parts = _split_template(mode)
+    return None if parts is None else parts[0]
+
+
+def format_user_prompt(question: str, mode: str = "exam") -> Optional[str]:
+    """
+    Format the question part of a mode's prompt (everything after the system prompt).
+    
+    get_system_prompt(mode) + "\n\n" + format_user_prompt(question, mode)
+    equals format_prompt(question, mode).
+    
+    Args:
+        question: The question to format
+        mode: Answer mode ('exam', 'local', 'global', 'mixed')
+    
+    Returns:
+        Formatted question prompt, or None if mode is invalid
+    """
+    parts = _split_template(mode)
+    return None if parts is None else parts[1] + question + parts[2]
 
 
 def get_available_modes() -> list:
@@ -118,7 +188,7 @@ def get_available_modes() -> list:
     Returns:
         List of mode names
     """
-    return list(PROMPT_TEMPLATES.keys())
+    return list(_MODES_LIST)
 
 
 def validate_mode(mode: str) -> bool:
@@ -131,7 +201,7 @@ def validate_mode(mode: str) -> bool:
     Returns:
         True if mode is valid, False otherwise
     """
-    return mode in PROMPT_TEMPLATES
+    return mode in _MODES
 
 
 if __name__ == "__main__":
@@ -27,12 +27,126 @@ import os
 from datetime import datetime
 
 from scripts.embeddings import EmbeddingGenerator, cache_embeddings, load_cached_embeddings
-from scripts.load_data import load_questions
+from scripts.load_data import load_questions, DATA_FILE
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Corpus sizes (number of vectors) at which build_index() switches from an
+# exact flat index to approximate ones with sublinear search
+HNSW_MIN_VECTORS = 10_000
+IVFPQ_MIN_VECTORS = 100_000
+
+# Search-time accuracy settings for the approximate indexes
+HNSW_EF_SEARCH = 64
+IVF_NPROBE = 16
+
+
+def _normalize_rows(matrix: np.ndarray) -> np.ndarray:
+    """Return a float32 copy of matrix with L2-normalized rows."""
+    matrix = np.asarray(matrix, dtype=np.float32)
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    return matrix / (norms + 1e-8)
+
+
+def _quantize_rows(matrix: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Symmetric per-row int8 quantization.
+    
+    Args:
+        matrix: Float matrix (N x d)
+    
+    Returns:
+        Tuple of (int8 codes (N x d), float32 scales (N,)) such that
+        matrix ≈ codes * scales[:, None]
+    """
+    matrix = np.atleast_2d(np.asarray(matrix, dtype=np.float32))
+    scales = np.abs(matrix).max(axis=1) / 127.0
+    scales[scales == 0] = 1.0
+    codes = np.round(matrix / scales[:, None]).astype(np.int8)
+    return codes, scales.astype(np.float32)
+
+
+def _score_batch(
+    query_vec: np.ndarray,
+    doc_codes: np.ndarray,
+    doc_scales: np.ndarray
+) -> np.ndarray:
+    """
+    Cosine similarity between a query and every row of a document matrix.
+    
+    Documents are stored as int8 codes of L2-normalized embeddings (see
+    _quantize_rows), a quarter of the FP32 size. The query is quantized the
+    same way, the dot products are accumulated in int32 and rescaled.
+    
+    Args:
+        query_vec: Query embedding (d,)
+        doc_codes: int8 document codes (N x d)
+        doc_scales: Per-row scales (N,)
+    
+    Returns:
+        Similarity scores (N,)
+    """
+    query_codes, query_scale = _quantize_rows(_normalize_rows(query_vec.reshape(1, -1)))
+    dots = np.einsum("ij,j->i", doc_codes, query_codes[0], dtype=np.int32)
+    return dots * (doc_scales * query_scale[0])
+
+
+def _create_index(embeddings: np.ndarray, index_type: str = "auto") -> faiss.Index:
+    """
+    Create a FAISS index for the embeddings (not yet added).
+    
+    With index_type "auto" the type follows the corpus size:
+    - flat: exact L2 search, best below HNSW_MIN_VECTORS
+    - hnsw: graph index (32 links per node), below IVFPQ_MIN_VECTORS
+    - ivfpq: 1024 inverted lists with 32-byte product-quantized codes,
+      trained on the embeddings; about 1/48 of the flat index memory
+    
+    Args:
+        embeddings: Float32 embedding matrix (N x d)
+        index_type: 'auto', 'flat', 'hnsw' or 'ivfpq'
+    
+    Returns:
+        Empty FAISS index using L2 distance
+    """
+    n, dim = embeddings.shape
+    if index_type == "auto":
+        if n >= IVFPQ_MIN_VECTORS:
+            index_type = "ivfpq"
+        elif n >= HNSW_MIN_VECTORS:
+            index_type = "hnsw"
+        else:
+            index_type = "flat"
+    
+    if index_type == "flat":
+        index = faiss.IndexFlatL2(dim)
+    elif index_type == "hnsw":
+        index = faiss.IndexHNSWFlat(dim, 32)
+    elif index_type == "ivfpq":
+        # PQ needs the dimension to split evenly into 32 sub-vectors
+        codec = "PQ32" if dim % 32 == 0 else "Flat"
+        index = faiss.index_factory(dim, f"IVF1024,{codec}")
+        index.train(embeddings)
+    else:
+        raise ValueError(f"Unknown index type: {index_type}")
+    
+    _configure_search(index)
+    logger.info(f"Using {index_type} FAISS index for {n} vectors")
+    return index
+
+
+def _configure_search(index: faiss.Index) -> None:
+    """Apply search-time settings (efSearch / nprobe) to an approximate index."""
+    if isinstance(index, faiss.IndexHNSW):
+        index.hnsw.efSearch = HNSW_EF_SEARCH
+        return
+    
+    try:
+        faiss.extract_index_ivf(index).nprobe = IVF_NPROBE
+    except RuntimeError:
+        pass  # Not an IVF index
+
 
 class RAGSystem:
     """
@@ -50,7 +164,8 @@ class RAGSystem:
         self,
         model_name: str = "all-MiniLM-L6-v2",
         index_path: str = "data/rag_index.faiss",
-        metadata_path: str = "data/rag_metadata.json"
+        metadata_path: str = "data/rag_metadata.json",
+        index_type: str = "auto"
     ):
         """
         Initialize RAG system.
@@ -59,15 +174,20 @@ class RAGSystem:
             model_name: Sentence transformer model name
             index_path: Path to save/load FAISS index
             metadata_path: Path to save/load metadata
+            index_type: FAISS index built by build_index(): 'auto' (by
+                        corpus size), 'flat', 'hnsw' or 'ivfpq'
         """
         logger.info("Initializing RAG System")
         
         self.embedding_generator = EmbeddingGenerator(model_name=model_name)
         self.faiss_index = None
         self.metadata = []
+        self.doc_codes = None  # int8 normalized embeddings for direct scoring
+        self.doc_scales = None
         self.topic_cache = {}  # Cache for common topics
         self.index_path = index_path
         self.metadata_path = metadata_path
+        self.index_type = index_type
         
         logger.info("✓ RAG System initialized")
     
@@ -88,14 +208,16 @@ class RAGSystem:
             embeddings, metadata = self.embedding_generator.embed_questions(questions)
             
             # Create FAISS index
-            embedding_dim = embeddings.shape[1]
-            self.faiss_index = faiss.IndexFlatL2(embedding_dim)
+            embeddings_float32 = embeddings.astype(np.float32)
+            self.faiss_index = _create_index(embeddings_float32, self.index_type)
             
             # Add embeddings to index
-            embeddings_float32 = embeddings.astype(np.float32)
             self.faiss_index.add(embeddings_float32)
             
             self.metadata = metadata
+            self.doc_codes, self.doc_scales = _quantize_rows(
+                _normalize_rows(embeddings_float32)
+            )
             
             logger.info(f"✓ Built FAISS index with {len(questions)} questions")
             logger.info(f"  Index size: {self.faiss_index.ntotal} vectors")
@@ -150,12 +272,15 @@ class RAGSystem:
             
             # Load FAISS index
             self.faiss_index = faiss.read_index(self.index_path)
+            _configure_search(self.faiss_index)
             
             # Load metadata
             if os.path.exists(self.metadata_path):
                 with open(self.metadata_path, 'r') as f:
                     self.metadata = json.load(f)
             
+            self._load_doc_codes()
+            
             logger.info(f"✓ Loaded index with {self.faiss_index.ntotal} vectors")
             return True
         
@@ -163,6 +288,15 @@ class RAGSystem:
             logger.error(f"Failed to load index: {e}")
             return False
     
+    def _load_doc_codes(self) -> None:
+        """Rebuild the quantized scoring matrix from the vectors stored in the index."""
+        try:
+            vectors = self.faiss_index.reconstruct_n(0, self.faiss_index.ntotal)
+            self.doc_codes, self.doc_scales = _quantize_rows(_normalize_rows(vectors))
+        except RuntimeError as e:
+            logger.warning(f"Index does not support reconstruction: {e}")
+            self.doc_codes, self.doc_scales = None, None
+    
     def retrieve_notes(
         self,
         query: str,
@@ -203,13 +337,13 @@ class RAGSystem:
             # For L2 distance: similarity ≈ 1 / (1 + distance)
             similarities = 1.0 / (1.0 + distances[0])
             
-            # Build results
+            # Build results (FAISS pads missing neighbours with index -1)
             results = []
-            for idx, similarity in zip(indices[0], similarities):
-                if idx < len(self.metadata) and similarity >= similarity_threshold:
+            for idx, distance, similarity in zip(indices[0], distances[0], similarities):
+                if 0 <= idx < len(self.metadata) and similarity >= similarity_threshold:
                     result = self.metadata[idx].copy()
                     result["similarity_score"] = float(similarity)
-                    result["distance"] = float(distances[0][list(indices[0]).index(idx)])
+                    result["distance"] = float(distance)
                     results.append(result)
             
             logger.info(f"✓ Retrieved {len(results)} similar questions")
@@ -220,6 +354,63 @@ class RAGSystem:
             logger.error(f"Failed to retrieve notes: {e}")
             return []
     
+    def retrieve_batch(
+        self,
+        queries: List[str],
+        top_k: int = 5,
+        similarity_threshold: float = 0.3
+    ) -> List[List[Dict]]:
+        """
+        Retrieve top K similar questions for several queries at once.
+        
+        Equivalent to calling retrieve_notes() per query, but embeds all
+        queries in one batch and runs a single FAISS search.
+        
+        Args:
+            queries: Query strings
+            top_k: Number of results per query
+            similarity_threshold: Minimum similarity score (0-1)
+        
+        Returns:
+            One list of retrieved questions per query, in query order
+        """
+        if not queries:
+            return []
+        
+        if self.faiss_index is None or len(self.metadata) == 0:
+            logger.warning("FAISS index not initialized")
+            return [[] for _ in queries]
+        
+        logger.info(f"Retrieving top {top_k} similar questions for {len(queries)} queries")
+        
+        try:
+            # Embed all queries in one batch
+            query_embeddings = self.embedding_generator.embed_texts(queries)
+            query_embeddings = np.ascontiguousarray(query_embeddings, dtype=np.float32)
+            
+            # Search index once for the whole batch
+            distances, indices = self.faiss_index.search(query_embeddings, top_k)
+            similarities = 1.0 / (1.0 + distances)
+            
+            batch_results = []
+            for row_indices, row_distances, row_similarities in zip(indices, distances, similarities):
+                results = []
+                for idx, distance, similarity in zip(row_indices, row_distances, row_similarities):
+                    if 0 <= idx < len(self.metadata) and similarity >= similarity_threshold:
+                        result = self.metadata[idx].copy()
+                        result["similarity_score"] = float(similarity)
+                        result["distance"] = float(distance)
+                        results.append(result)
+                batch_results.append(results)
+            
+            logger.info(f"✓ Retrieved results for {len(batch_results)} queries")
+            
+            return batch_results
+        
+        except Exception as e:
+            logger.error(f"Failed to retrieve notes: {e}")
+            return [[] for _ in queries]
+    
     def retrieve_by_unit(
         self,
         unit: str,
@@ -240,30 +431,42 @@ class RAGSystem:
         logger.info(f"Retrieving {top_k} questions from unit: {unit}")
         
         # Filter metadata by unit
-        unit_questions = [
-            m for m in self.metadata
-            if m.get("unit", "").upper() == unit.upper()
+        unit_upper = unit.upper()
+        positions = [
+            i for i, m in enumerate(self.metadata)
+            if m.get("unit", "").upper() == unit_upper
         ]
         
-        if not unit_questions:
+        if not positions:
             logger.warning(f"No questions found for unit: {unit}")
             return []
         
-        # If query provided, rank by semantic similarity
-        if query:
-            query_embedding = self.embedding_generator.embed_text(query)
-            
-            # Calculate similarities
-            for q in unit_questions:
-                # Re-embed question for similarity
-                q_embedding = self.embedding_generator.embed_text(q.get("question", ""))
-                similarity = self.embedding_generator.similarity(query_embedding, q_embedding)
-                q["similarity_score"] = similarity
-            
-            # Sort by similarity
-            unit_questions.sort(key=lambda x: x.get("similarity_score", 0), reverse=True)
+        # Without a query, keep index order
+        if not query:
+            return [self.metadata[i].copy() for i in positions[:top_k]]
+        
+        # Rank by semantic similarity, scoring all unit questions at once
+        query_embedding = self.embedding_generator.embed_text(query)
         
-        return unit_questions[:top_k]
+        if self.doc_codes is not None:
+            doc_codes = self.doc_codes[positions]
+            doc_scales = self.doc_scales[positions]
+        else:
+            doc_codes, doc_scales = _quantize_rows(_normalize_rows(
+                self.embedding_generator.embed_texts(
+                    [self.metadata[i].get("question", "") for i in positions]
+                )
+            ))
+        
+        scores = _score_batch(query_embedding, doc_codes, doc_scales)
+        
+        results = []
+        for j in np.argsort(-scores, kind="stable")[:top_k]:
+            result = self.metadata[positions[j]].copy()
+            result["similarity_score"] = float(scores[j])
+            results.append(result)
+        
+        return results
     
     def cache_topic(self, topic: str, questions: List[Dict]) -> None:
         """
@@ -315,7 +518,7 @@ class RAGSystem:
             "embedding_dimension": self.faiss_index.d,
             "questions_per_unit": units,
             "questions_per_year": years,
-            "cached_topics": list(self.topic_cache.keys()),
+            "cached_topics": list(self.topic_cache),
             "index_path": self.index_path,
             "metadata_path": self.metadata_path
         }
@@ -347,6 +550,12 @@ class RAGSystem:
             
             # Update metadata
             self.metadata.extend(new_metadata)
+            if self.doc_codes is not None:
+                new_codes, new_scales = _quantize_rows(
+                    _normalize_rows(new_embeddings_float32)
+                )
+                self.doc_codes = np.vstack([self.doc_codes, new_codes])
+                self.doc_scales = np.concatenate([self.doc_scales, new_scales])
             
             logger.info(f"✓ Updated index. Total questions: {self.faiss_index.ntotal}")
             
@@ -365,7 +574,7 @@ def initialize_rag_system(
     
     This function:
     1. Loads questions from load_data.py
-    2. Tries to load cached index
+    2. Tries to load cached index (unless the questions file is newer)
     3. Builds index if needed
     4. Saves index for future use
     
@@ -381,6 +590,12 @@ def initialize_rag_system(
         # Initialize RAG system
         rag = RAGSystem()
         
+        # An index saved before the questions file changed is out of date
+        if (os.path.exists(rag.index_path)
+                and os.path.getmtime(rag.index_path) < os.path.getmtime(DATA_FILE)):
+            logger.info("Questions file changed since the index was saved, rebuilding")
+            force_rebuild = True
+        
         # Try to load existing index
         if not force_rebuild and rag.load_index():
             logger.info("✓ Loaded existing FAISS index")
@@ -0,0 +1,280 @@
+#!/usr/bin/env python3
+"""
+vLLM Client for OpenAI-Compatible Model Serving.
+
+This module handles communication with a vLLM server. It exposes the same
+interface as OllamaClient, so MCPClient can use either backend.
+
+vLLM uses continuous batching, so concurrent requests (several Streamlit
+users, batch answering) are processed together on the GPU instead of queueing
+behind each other.
+
+Configuration:
+- vLLM server: http://localhost:8000
+- Model: meta-llama/Llama-2-7b-chat-hf
+
+Start the server with:
+    python -m vllm.entrypoints.openai.api_server \
+        --model meta-llama/Llama-2-7b-chat-hf \
+        --max-num-seqs 64 --enable-chunked-prefill
+"""
+
+import requests
+import json
+import os
+import sys
+from typing import Optional, Iterator
+import logging
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from scripts.http_session import PooledHTTPClient
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+class VLLMClient(PooledHTTPClient):
+    """
+    Client for communicating with a vLLM OpenAI-compatible server.
+    
+    vLLM loads the model at server start, so the inherited warm_up() only
+    checks the connection.
+    
+    Attributes:
+        base_url (str): vLLM server URL
+        model (str): Model name served by vLLM
+        timeout (int): Request timeout in seconds
+    """
+    
+    def __init__(
+        self,
+        base_url: str = "http://localhost:8000",
+        model: str = "meta-llama/Llama-2-7b-chat-hf",
+        timeout: int = 300
+    ):
+        """
+        Initialize vLLM client.
+        
+        Args:
+            base_url: vLLM server URL
+            model: Model name to use (must match the --model of the server)
+            timeout: Request timeout in seconds (default 300 for long responses)
+        """
+        super().__init__(base_url, model, timeout)
+        self.endpoint = f"{base_url}/v1/completions"
+        
+        logger.info(f"Initialized VLLMClient: {base_url}, model: {model}")
+    
+    def _payload(
+        self,
+        prompt: str,
+        temperature: float,
+        top_p: float,
+        top_k: int,
+        num_predict: int,
+        stream: bool,
+        system: Optional[str] = None
+    ) -> dict:
+        """Build a /v1/completions request body."""
+        if system:
+            prompt = f"{system}\n\n{prompt}"
+        return {
+            "model": self.model,
+            "prompt": prompt,
+            "stream": stream,
+            "temperature": temperature,
+            "top_p": top_p,
+            "top_k": top_k,
+            "max_tokens": num_predict
+        }
+    
+    def query_model(
+        self,
+        prompt: str,
+        temperature: float = 0.7,
+        top_p: float = 0.9,
+        top_k: int = 40,
+        num_predict: int = 512,
+        system: Optional[str] = None
+    ) -> Optional[str]:
+        """
+        Send a prompt to the vLLM model and get a response.
+        
+        Args:
+            prompt: The prompt to send to the model
+            temperature: Sampling temperature (0.0-1.0). Higher = more creative
+            top_p: Nucleus sampling parameter
+            top_k: Top-k sampling parameter
+            num_predict: Maximum tokens to generate
+            system: Optional system prompt, placed before the prompt as a
+                    shared prefix (reused with --enable-prefix-caching)
+        
+        Returns:
+            Model response as string, or None if request fails
+        """
+        try:
+            payload = self._payload(prompt, temperature, top_p, top_k, num_predict, False, system)
+            
+            logger.info(f"Sending prompt to {self.model} (temp={temperature})")
+            
+            response = self.session.post(
+                self.endpoint,
+                json=payload,
+                timeout=self.timeout
+            )
+            
+            if response.status_code != 200:
+                logger.error(f"vLLM error: {response.status_code} - {response.text}")
+                return None
+            
+            choices = response.json().get("choices", [])
+            answer = choices[0].get("text", "").strip() if choices else ""
+            
+            logger.info(f"Received response ({len(answer)} chars)")
+            return answer
+        
+        except requests.exceptions.ConnectionError:
+            logger.error("Failed to connect to vLLM server. Is it running?")
+            return None
+        except requests.exceptions.Timeout:
+            logger.error(f"Request timeout after {self.timeout} seconds")
+            return None
+        except json.JSONDecodeError:
+            logger.error("Failed to parse vLLM response")
+            return None
+        except Exception as e:
+            logger.error(f"Unexpected error: {str(e)}")
+            return None
+    
+    def stream_model(
+        self,
+        prompt: str,
+        temperature: float = 0.7,
+        top_p: float = 0.9,
+        top_k: int = 40,
+        num_predict: int = 512,
+        system: Optional[str] = None
+    ) -> Iterator[str]:
+        """
+        Send a prompt to the vLLM model and yield the response as it is generated.
+        
+        The server sends server-sent events ("data: {...}" lines) and ends
+        the stream with "data: [DONE]".
+        
+        Args:
+            prompt: The prompt to send to the model
+            temperature: Sampling temperature (0.0-1.0). Higher = more creative
+            top_p: Nucleus sampling parameter
+            top_k: Top-k sampling parameter
+            num_predict: Maximum tokens to generate
+            system: Optional system prompt, placed before the prompt as a
+                    shared prefix (reused with --enable-prefix-caching)
+        
+        Yields:
+            Response text chunks. Nothing more is yielded if the request fails.
+        """
+        payload = self._payload(prompt, temperature, top_p, top_k, num_predict, True, system)
+        
+        logger.info(f"Streaming prompt to {self.model} (temp={temperature})")
+        
+        try:
+            with self.session.post(
+                self.endpoint,
+                json=payload,
+                timeout=self.timeout,
+                stream=True
+            ) as response:
+                if response.status_code != 200:
+                    logger.error(f"vLLM error: {response.status_code} - {response.text}")
+                    return
+                
+                for line in response.iter_lines():
+                    if not line.startswith(b"data:"):
+                        continue
+                    data = line[len(b"data:"):].strip()
+                    if data == b"[DONE]":
+                        break
+                    choices = json.loads(data).get("choices", [])
+                    text = choices[0].get("text", "") if choices else ""
+                    if text:
+                        yield text
+        
+        except requests.exceptions.ConnectionError:
+            logger.error("Failed to connect to vLLM server. Is it running?")
+        except requests.exceptions.Timeout:
+            logger.error(f"Request timeout after {self.timeout} seconds")
+        except json.JSONDecodeError:
+            logger.error("Failed to parse vLLM response")
+    
+    def check_connection(self) -> bool:
+        """
+        Check if vLLM server is running and accessible.
+        
+        Returns:
+            True if connection successful, False otherwise
+        """
+        try:
+            response = self.session.get(
+                f"{self.base_url}/v1/models",
+                timeout=5
+            )
+            if response.status_code == 200:
+                logger.info("✓ Connected to vLLM server")
+                return True
+            else:
+                logger.warning(f"vLLM server returned status {response.status_code}")
+                return False
+        except Exception as e:
+            logger.error(f"Cannot connect to vLLM: {str(e)}")
+            return False
+    
+    def list_models(self) -> Optional[list]:
+        """
+        List models served by the vLLM server.
+        
+        Returns:
+            List of model names, or None if request fails
+        """
+        try:
+            response = self.session.get(
+                f"{self.base_url}/v1/models",
+                timeout=5
+            )
+            if response.status_code == 200:
+                models = response.json().get("data", [])
+                model_names = [m.get("id") for m in models]
+                logger.info(f"Available models: {model_names}")
+                return model_names
+            return None
+        except Exception as e:
+            logger.error(f"Failed to list models: {str(e)}")
+            return None
+
+
+if __name__ == "__main__":
+    # Test the vLLM client
+    print("=" * 60)
+    print("Testing vLLM Client")
+    print("=" * 60)
+    
+    client = VLLMClient()
+    
+    # Check connection
+    print("\n1. Checking connection...")
+    if not client.check_connection():
+        print("❌ Cannot connect to vLLM. Make sure it's running:")
+        print("   python -m vllm.entrypoints.openai.api_server --model meta-llama/Llama-2-7b-chat-hf")
+        exit(1)
+    
+    # Test query
+    print("\n2. Testing query...")
+    response = client.query_model("What is the capital of Kenya? Answer in one sentence.", temperature=0.5)
+    
+    if response:
+        print(f"✓ Response received:")
+        print(f"   {response}")
+    else:
+        print("❌ Failed to get response")
@@ -37,6 +37,12 @@ class TestITutorApp:
         """
         return ITutorApp(default_mode="exam")
     
+    @pytest.fixture
+    def stub_app(self, app):
+        """Fixture: ITutorApp whose LLM calls go to StubLLMClient."""
+        app.mcp_client.llm_client = StubLLMClient()
+        return app
+    
     @pytest.fixture
     def question_loader(self):
         """Fixture: Load questions for testing."""
@@ -90,6 +96,38 @@ class TestITutorApp:
                 assert field in question, \
                     f"Question should have '{field}' field"
     
+    def test_get_unit_is_cached(self, app):
+        """Test that repeated get_unit() calls reuse the cached result."""
+        first = app.get_unit("BBIT106")
+        second = app.get_unit(" bbit106 ")
+        
+        assert first is second, "Normalized unit lookups should hit the cache"
+    
+    def test_clear_cache(self, app):
+        """Test that clear_cache() forces a fresh lookup."""
+        first = app.get_unit("BBIT106")
+        app.clear_cache()
+        second = app.get_unit("BBIT106")
+        
+        assert first is not second, "clear_cache() should drop cached results"
+        assert len(first) == len(second), "Fresh lookup should return same data"
+    
+    def test_question_loader_reloads_changed_file(self, tmp_path):
+        """Test that reload_if_changed() picks up a modified questions file."""
+        import json
+        from scripts.load_data import QuestionLoader
+        
+        data_file = tmp_path / "questions.json"
+        question = {"course": "BBIT", "unit": "BBIT101", "year": "2023", "question": "Q1"}
+        data_file.write_text(json.dumps([question]), encoding="utf-8")
+        loader = QuestionLoader(str(data_file))
+        
+        assert loader.reload_if_changed() is False
+        
+        data_file.write_text(json.dumps([question, dict(question, question="Q2")]), encoding="utf-8")
+        assert loader.reload_if_changed() is True
+        assert loader.get_unit_counts() == {"BBIT101": 2}
+    
     # ==================== Tests for get_answer() ====================
     
     def test_get_answer_returns_string_or_none(self, app):
@@ -137,6 +175,80 @@ class TestITutorApp:
         # Should handle gracefully
         assert result is None or isinstance(result, str)
     
+    def test_get_answer_uses_answer_cache(self, tmp_path):
+        """Test that get_answer() returns a cached answer for the same mode."""
+        pytest.importorskip("faiss")
+        import numpy as np
+        from scripts.answer_cache import SemanticAnswerCache
+        
+        cache = SemanticAnswerCache(
+            embed_fn=lambda text: np.ones(8) if "OOP" in text else np.arange(8.0),
+            index_path=str(tmp_path / "cache.faiss"),
+            db_path=str(tmp_path / "cache.db")
+        )
+        app = ITutorApp(default_mode="exam", answer_cache=cache)
+        cache.put(cache.embed("What is OOP?"), "What is OOP?", "exam", "Cached answer")
+        
+        assert app.get_answer("Define OOP", mode="exam") == "Cached answer"
+        assert cache.lookup(cache.embed("What is OOP?"), "local") is None, \
+            "Cached answers should not be shared across modes"
+    
+    def test_stream_answer_yields_chunks(self, stub_app):
+        """Test that stream_answer() yields the LLM's chunks as they arrive."""
+        chunks = list(stub_app.stream_answer("What is Python?", mode="exam"))
+        
+        assert chunks == ["Answer ", "to: ", "What is Python?"], \
+            "stream_answer() should pass the model's chunks through"
+        
+        chunks = list(stub_app.stream_answer("What is OOP?", context="Past paper Q"))
+        assert chunks[-1] == "What is OOP?"
+        assert "Past paper Q" in stub_app.mcp_client.llm_client.prompts[-1], \
+            "Context should be included in the prompt"
+    
+    # ==================== Tests for get_answers_batch() ====================
+    
+    def test_get_answers_batch_returns_one_answer_per_question(self, stub_app):
+        """Test that get_answers_batch() returns answers in question order."""
+        questions = ["What is Python?", "What is a database?", "What is OOP?"]
+        result = stub_app.get_answers_batch(questions, mode="exam")
+        
+        assert result == [f"Answer to: {q}" for q in questions], \
+            "Answers should be returned in question order"
+    
+    def test_get_answers_batch_keeps_failed_slots(self, stub_app):
+        """Test that a failed question yields None without losing the others."""
+        result = stub_app.get_answers_batch(["What is Python?", "FAIL here"])
+        
+        assert result == ["Answer to: What is Python?", None]
+    
+    def test_get_answers_batch_with_empty_list(self, app):
+        """Test get_answers_batch() with no questions."""
+        assert app.get_answers_batch([]) == []
+    
+    def test_get_answers_with_context_batch_retrieves_once(self):
+        """Test that context for the whole batch comes from one retrieval."""
+        class StubRAG:
+            calls = 0
+            
+            def retrieve_batch(self, queries, top_k=3):
+                self.calls += 1
+                return [
+                    [{"question": "Past question", "unit": "BBIT106",
+                      "year": 2023, "similarity_score": 0.9}]
+                    for _ in queries
+                ]
+        
+        rag = StubRAG()
+        app = ITutorApp(default_mode="exam", rag_system=rag)
+        llm = app.mcp_client.llm_client = StubLLMClient()
+        questions = ["What is OOP?", "What is a database?"]
+        result = app.get_answers_with_context_batch(questions)
+        
+        assert result == [f"Answer to: {q}" for q in questions]
+        assert rag.calls == 1, "Retrieval should be batched into a single call"
+        assert all("Past question" in prompt for prompt in llm.prompts), \
+            "Retrieved context should reach every prompt"
+    
     # ==================== Tests for generate_cat_quiz() ====================
     
     def test_generate_cat_quiz_returns_dict_or_none(self, app):
@@ -199,6 +311,16 @@ class TestITutorApp:
             assert q1_texts != q2_texts or len(q1_texts) == 0, \
                 "Quizzes should likely be different (randomness test)"
     
+    def test_generate_cat_quizzes(self, app):
+        """Test generate_cat_quizzes() returns one quiz per unit."""
+        result = app.generate_cat_quizzes(["BBIT106", "INVALID_UNIT_XYZ"], num_questions=2)
+        
+        assert set(result) == {"BBIT106", "INVALID_UNIT_XYZ"}, \
+            "Should return an entry for every requested unit"
+        assert result["INVALID_UNIT_XYZ"] is None, "Invalid unit should map to None"
+        if result["BBIT106"]:
+            assert len(result["BBIT106"]["questions"]) == 2
+    
     # ==================== Tests for utility methods ====================
     
     def test_get_available_units(self, app):
@@ -249,6 +371,40 @@ class TestITutorApp:
         app2 = get_app()
         
         assert app1 is app2, "get_app() should return same instance"
+    
+    def test_get_app_concurrent_first_calls(self, monkeypatch):
+        """Test that concurrent first calls to get_app() share one instance."""
+        import threading
+        import app.main as main_module
+        
+        monkeypatch.setattr(main_module, "_app_instance", None)
+        instances = []
+        threads = [
+            threading.Thread(target=lambda: instances.append(get_app()))
+            for _ in range(4)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        
+        assert len({id(instance) for instance in instances}) == 1, \
+            "Only one ITutorApp should be created"
+    
+    def test_get_app_creates_answer_cache(self, monkeypatch):
+        """Test that get_app(use_answer_cache=True) attaches the answer cache."""
+        import app.main as main_module
+        
+        class StubCache:
+            def save(self):
+                return True
+        
+        cache = StubCache()
+        monkeypatch.setattr(main_module, "_app_instance", None)
+        monkeypatch.setattr(main_module, "create_answer_cache", lambda: cache)
+        monkeypatch.setattr(main_module.atexit, "register", lambda fn: fn)
+        
+        assert get_app(use_answer_cache=True).answer_cache is cache
 
 
 class TestIntegration:
@@ -328,6 +484,549 @@ class TestEdgeCases:
         assert result is None or isinstance(result, str)
 
 
+class TestPrompts:
+    """Tests for the system/user prompt split."""
+    
+    def test_split_prompt_matches_full_prompt(self):
+        """Test that system + user prompt rebuild the full prompt for every mode."""
+        from scripts.prompts import (
+            format_prompt, format_user_prompt, get_system_prompt, get_available_modes
+        )
+        question = "What is {OOP}?"
+        
+        for mode in get_available_modes():
+            combined = f"{get_system_prompt(mode)}\n\n{format_user_prompt(question, mode)}"
+            assert combined == format_prompt(question, mode), \
+                f"Split prompt for '{mode}' should match format_prompt()"
+    
+    def test_split_prompt_invalid_mode(self):
+        """Test that an invalid mode returns None."""
+        from scripts.prompts import format_user_prompt, get_system_prompt
+        
+        assert get_system_prompt("invalid") is None
+        assert format_user_prompt("What is OOP?", "invalid") is None
+
+
+class TestFixUnknownUnits:
+    """Tests for the Unknown unit export/template/apply tooling."""
+    
+    @pytest.fixture(params=["optional", "stdlib"])
+    def fix_units(self, request, tmp_path, monkeypatch):
+        """
+        Fixture: fix_unknown_units with its files in tmp_path.
+        
+        Runs once with the optional ijson/orjson modules (if installed) and
+        once with the json fallbacks only.
+        """
+        import scripts.fix_unknown_units as fix_units
+        
+        if request.param == "stdlib":
+            monkeypatch.setattr(fix_units, "ijson", None)
+            monkeypatch.setattr(fix_units, "orjson", None)
+        for name, filename in [
+            ("INPUT_FILE", "questions.json"),
+            ("INPUT_JSONL", "questions.jsonl"),
+            ("UNKNOWN_EXPORT", "export.json"),
+            ("UNIT_MAPPING", "mapping.json"),
+            ("OUTPUT_FILE", "fixed.json"),
+        ]:
+            monkeypatch.setattr(fix_units, name, str(tmp_path / filename))
+        return fix_units
+    
+    @pytest.fixture
+    def questions(self, fix_units):
+        """Fixture: small dataset written to INPUT_FILE."""
+        import json
+        
+        questions = [
+            {
+                "question": f"Question {i} — näive “quote” \\ {{x}}",
+                "unit": "Unknown" if i % 3 == 0 else f"BBIT10{i % 2}",
+                "year": 2020 + i % 4,
+                "question_number": i,
+                "course": "BBIT",
+                "source_file": [f"paper{i % 4}.pdf", None][i % 7 == 0],
+            }
+            for i in range(40)
+        ]
+        del questions[5]["unit"]
+        with open(fix_units.INPUT_FILE, "w", encoding="utf-8") as f:
+            json.dump(questions, f, ensure_ascii=False)
+        return questions
+    
+    def test_read_questions_round_trip(self, fix_units, questions):
+        """Test that read_questions() returns the dataset unchanged."""
+        assert list(fix_units.read_questions(fix_units.INPUT_FILE)) == questions
+    
+    def test_json_to_jsonl_round_trip(self, fix_units, questions):
+        """Test that the JSONL copy holds the same questions and is used once written."""
+        assert fix_units.dataset_path() == fix_units.INPUT_FILE
+        
+        fix_units.json_to_jsonl()
+        
+        assert fix_units.dataset_path() == fix_units.INPUT_JSONL
+        assert list(fix_units.read_questions(fix_units.INPUT_JSONL)) == questions
+        assert list(fix_units.iter_questions()) == questions
+    
+    def test_write_questions_round_trip(self, fix_units, questions, tmp_path):
+        """Test that write_questions() output parses back, compact or indented."""
+        import json
+        
+        for indent in (False, True):
+            path = str(tmp_path / f"out_{indent}.json")
+            fix_units.write_questions(iter(questions), path, indent=indent)
+            with open(path, encoding="utf-8") as f:
+                assert json.load(f) == questions
+        
+        fix_units.write_questions(iter([]), path, indent=True)
+        with open(path, encoding="utf-8") as f:
+            assert json.load(f) == []
+    
+    def test_unknown_export_matches_json_dump(self, fix_units, questions):
+        """Test that the hand-written export is byte-identical to json.dump output."""
+        import json
+        
+        unknown = fix_units.scan_dataset()["unknown"]
+        fix_units.write_unknown_export(unknown)
+        
+        by_source = {}
+        for i, q in enumerate(questions):
+            if q.get("unit", "Unknown") == "Unknown":
+                by_source.setdefault(q["source_file"], []).append({
+                    "index": i,
+                    "year": q["year"],
+                    "source_file": q["source_file"],
+                    "question_number": q["question_number"],
+                    "course": q["course"],
+                    "full_question": q["question"],
+                    "current_unit": "Unknown",
+                    "suggested_unit": "ENTER_UNIT_CODE_HERE",
+                })
+        expected = {
+            "total_unknown": sum(len(v) for v in by_source.values()),
+            "by_source_file": by_source,
+            "instructions": fix_units.EXPORT_INSTRUCTIONS,
+        }
+        
+        with open(fix_units.UNKNOWN_EXPORT, "rb") as f:
+            assert f.read() == json.dumps(expected, indent=2, ensure_ascii=False).encode("utf-8")
+    
+    def test_count_units_matches_parsed_counts(self, fix_units, questions):
+        """Test count_units() on JSON, JSONL, and JSONL with a missing unit."""
+        from collections import Counter
+        
+        expected = Counter(q.get("unit", "Unknown") for q in questions)
+        
+        # JSON array, and JSONL where one question has no unit (fallback)
+        assert fix_units.count_units(fix_units.INPUT_FILE) == (len(questions), expected)
+        fix_units.json_to_jsonl()
+        assert fix_units.count_units(fix_units.INPUT_JSONL) == (len(questions), expected)
+        
+        # JSONL where every question has a unit (byte scan)
+        questions[5]["unit"] = "Unknown"
+        fix_units.write_questions(iter(questions), fix_units.INPUT_FILE)
+        fix_units.json_to_jsonl()
+        expected = Counter(q["unit"] for q in questions)
+        assert fix_units.count_units(fix_units.INPUT_JSONL) == (len(questions), expected)
+    
+    def test_parallel_mapping_matches_serial(self, fix_units, questions, monkeypatch):
+        """Test that the worker-process mapping template equals the single-pass one."""
+        fix_units.write_mapping_template(fix_units.scan_dataset()["unknown"])
+        with open(fix_units.UNIT_MAPPING, "rb") as f:
+            serial = f.read()
+        
+        fix_units.json_to_jsonl()
+        for workers in (1, 3, 64):
+            fix_units.save_mapping_template(
+                *fix_units.parallel_unknown_mappings(fix_units.INPUT_JSONL, workers)
+            )
+            with open(fix_units.UNIT_MAPPING, "rb") as f:
+                assert f.read() == serial, f"{workers} workers should match the serial template"
+        
+        monkeypatch.setattr(fix_units, "PARALLEL_MIN_QUESTIONS", 0)
+        fix_units.create_mapping_template()
+        with open(fix_units.UNIT_MAPPING, "rb") as f:
+            assert f.read() == serial
+    
+    def test_apply_unit_fixes(self, fix_units, questions):
+        """Test that filled-in mappings are applied to the fixed dataset."""
+        import json
+        
+        fix_units.create_mapping_template()
+        with open(fix_units.UNIT_MAPPING, encoding="utf-8") as f:
+            mapping = json.load(f)
+        mapping["mappings"]["paper3.pdf"]["3"] = "BBIT200"
+        with open(fix_units.UNIT_MAPPING, "w", encoding="utf-8") as f:
+            json.dump(mapping, f)
+        
+        assert fix_units.apply_unit_fixes(fix_units.UNIT_MAPPING) is True
+        
+        with open(fix_units.OUTPUT_FILE, encoding="utf-8") as f:
+            fixed = json.load(f)
+        questions[3]["unit"] = "BBIT200"
+        assert fixed == questions
+
+
+class TestDeduplication:
+    """Tests for duplicate detection and canonical selection."""
+    
+    @pytest.fixture
+    def questions(self):
+        """Fixture: questions with two duplicate groups."""
+        return [
+            {"question": "What is OOP?", "unit": "Unknown", "year": 2019},
+            {"question": "Define a database.", "unit": "BBIT106", "year": 2021},
+            {"question": " What is OOP? ", "unit": "BBIT106", "year": 2022},
+            {"question": "What is OOP?", "unit": "BBIT106", "year": 2020},
+            {"question": "Define a database.", "unit": "BBIT106", "year": 2021,
+             "metadata": {"page": 3}},
+            {"question": "What is oop?", "unit": "BBIT106", "year": 2018},
+        ]
+    
+    def test_find_duplicates_groups_identical_text(self, questions):
+        """Test that questions are grouped on stripped, case-sensitive text."""
+        from scripts.deduplicate_questions import find_duplicates
+        
+        groups = find_duplicates(questions)
+        
+        assert sorted(groups) == [[0, 2, 3], [1, 4]]
+    
+    def test_find_duplicates_survives_hash_collisions(self, questions, monkeypatch):
+        """Test that texts sharing a hash bucket are still compared by text."""
+        import scripts.deduplicate_questions as dedup
+        
+        monkeypatch.setattr(dedup, "_text_key", lambda text: 0)
+        
+        assert sorted(dedup.find_duplicates(questions)) == [[0, 2, 3], [1, 4]]
+    
+    def test_select_canonical_versions_priority(self, questions):
+        """Test known unit, then earliest year, then metadata, then position."""
+        from scripts.deduplicate_questions import select_canonical_versions
+        
+        # [0, 2, 3]: 0 has an Unknown unit, 3 is earlier than 2.
+        # [1, 4]: same year, 4 has metadata. [5]: single member.
+        assert select_canonical_versions(questions, [[0, 2, 3], [1, 4], [5]]) == [3, 4, 5]
+        assert select_canonical_versions(questions, []) == []
+    
+    def test_deduplicate_questions_report(self, questions):
+        """Test that duplicates collapse into one canonical question each."""
+        from scripts.deduplicate_questions import deduplicate_questions
+        
+        deduplicated, report = deduplicate_questions(questions)
+        
+        assert report["total_duplicates_found"] == 2
+        assert report["total_duplicate_instances"] == 3
+        assert report["questions_removed"] == 3
+        assert [q["year"] for q in deduplicated] == [2020, 2021, 2018]
+        assert deduplicated[0]["metadata"]["duplicate_count"] == 3
+        assert deduplicated[2]["metadata"]["is_deduplicated"] is False
+
+
+class TestRAGRetrieval:
+    """Tests for RAGSystem retrieval, using a deterministic stub embedder."""
+    
+    @pytest.fixture
+    def rag(self, monkeypatch, tmp_path):
+        """Fixture: RAGSystem over a small indexed dataset."""
+        import zlib
+        import numpy as np
+        pytest.importorskip("faiss")
+        import scripts.rag as rag_module
+        from scripts.embeddings import EmbeddingGenerator
+        
+        class StubEmbedder(EmbeddingGenerator):
+            def __init__(self, model_name=None):
+                self.embedding_dim = 16
+            
+            def embed_text(self, text):
+                seed = zlib.crc32(text.split()[0].encode("utf-8")) if text else 0
+                base = np.random.default_rng(seed).normal(size=self.embedding_dim)
+                noise = np.random.default_rng(zlib.crc32(text.encode("utf-8")))
+                return (base + 0.3 * noise.normal(size=self.embedding_dim)).astype(np.float32)
+            
+            def embed_texts(self, texts, batch_size=32):
+                return np.array([self.embed_text(t) for t in texts], dtype=np.float32)
+        
+        monkeypatch.setattr(rag_module, "EmbeddingGenerator", StubEmbedder)
+        rag = rag_module.RAGSystem(
+            index_path=str(tmp_path / "index.faiss"),
+            metadata_path=str(tmp_path / "metadata.json"),
+            index_type="flat"
+        )
+        topics = ["Define", "Explain", "Describe", "List"]
+        questions = [
+            {"question": f"{topics[i % 4]} concept number {i}", "unit": ["BBIT106", "ISO100"][i % 2],
+             "year": 2020 + i % 3}
+            for i in range(24)
+        ]
+        assert rag.build_index(questions)
+        return rag
+    
+    def test_retrieve_batch_matches_retrieve_notes(self, rag):
+        """Test that one batched search returns the per-query results."""
+        queries = ["Define concept number 4", "List anything", "Explain concept", ""]
+        
+        batch = rag.retrieve_batch(queries, top_k=5, similarity_threshold=0.0)
+        single = [rag.retrieve_notes(q, top_k=5, similarity_threshold=0.0) for q in queries]
+        
+        assert len(batch) == len(queries)
+        for batch_results, single_results in zip(batch, single):
+            assert [r["question"] for r in batch_results] == [r["question"] for r in single_results]
+            assert [r["similarity_score"] for r in batch_results] == pytest.approx(
+                [r["similarity_score"] for r in single_results], rel=1e-5
+            )
+        assert batch[0][0]["question"] == "Define concept number 4"
+        assert rag.retrieve_batch([]) == []
+    
+    def test_retrieve_by_unit_int8_scores_match_float(self, rag):
+        """Test that int8 scoring ranks a unit's questions like float cosine similarity."""
+        import numpy as np
+        
+        query = "Define concept number 4"
+        results = rag.retrieve_by_unit("bbit106", query=query, top_k=4)
+        
+        questions = [m["question"] for m in rag.metadata if m["unit"] == "BBIT106"]
+        vectors = rag.embedding_generator.embed_texts(questions)
+        vectors /= np.linalg.norm(vectors, axis=1, keepdims=True)
+        query_vec = rag.embedding_generator.embed_text(query)
+        cosine = vectors @ (query_vec / np.linalg.norm(query_vec))
+        
+        assert rag.doc_codes.dtype == np.int8
+        assert [r["unit"] for r in results] == ["BBIT106"] * 4
+        assert results[0]["question"] == query
+        assert [r["similarity_score"] for r in results] == pytest.approx(
+            sorted(cosine, reverse=True)[:4], abs=0.02
+        )
+        assert rag.retrieve_by_unit("UNKNOWN_UNIT", query=query) == []
+
+
+class StubLLMClient:
+    """LLM client stand-in that answers from the prompt and records calls."""
+    
+    def __init__(self, chunks=("Answer ", "to: ")):
+        self.chunks = list(chunks)
+        self.prompts = []
+    
+    def query_model(self, prompt, temperature=0.7, system=None, **kwargs):
+        self.prompts.append(prompt)
+        if "FAIL" in prompt:
+            return None
+        return "".join(self.chunks) + prompt.split("QUESTION:")[-1].split("\n")[1]
+    
+    def stream_model(self, prompt, temperature=0.7, system=None, **kwargs):
+        self.prompts.append(prompt)
+        yield from self.chunks
+        yield prompt.split("QUESTION:")[-1].split("\n")[1]
+    
+    def check_connection(self):
+        return True
+    
+    def close(self):
+        pass
+
+
+class TestMCPClientBatch:
+    """Tests for MCPClient batch answering with a stub LLM client."""
+    
+    @pytest.fixture
+    def client(self):
+        """Fixture: MCPClient whose LLM calls go to StubLLMClient."""
+        from mcp.client import MCPClient
+        
+        client = MCPClient(default_mode="exam")
+        client.llm_client = StubLLMClient()
+        return client
+    
+    def test_ollama_client_alias(self, client):
+        """Test that the old ollama_client name still reaches llm_client."""
+        assert client.ollama_client is client.llm_client
+        with pytest.raises(AttributeError):
+            client.ollama_client = StubLLMClient()
+    
+    def test_batch_answer_questions(self, client):
+        """Test that every question is answered once, failures as None."""
+        questions = ["What is OOP?", "FAIL this one", "What is OOP?", "What is SQL?"]
+        
+        answers = client.batch_answer_questions(questions, max_concurrency=2)
+        
+        assert answers == {
+            "What is OOP?": "Answer to: What is OOP?",
+            "FAIL this one": None,
+            "What is SQL?": "Answer to: What is SQL?",
+        }
+        assert len(client.llm_client.prompts) == 3, "Duplicate questions should be asked once"
+    
+    def test_batch_answer_questions_resumes_from_checkpoint(self, client, tmp_path):
+        """Test that answers saved in a checkpoint are not requested again."""
+        import json
+        
+        checkpoint = tmp_path / "checkpoint.json"
+        checkpoint.write_text(json.dumps({"What is OOP?": "Saved answer"}), encoding="utf-8")
+        questions = ["What is OOP?", "What is SQL?", "FAIL this one"]
+        
+        answers = client.batch_answer_questions(questions, checkpoint_path=checkpoint)
+        
+        assert answers == {
+            "What is OOP?": "Saved answer",
+            "What is SQL?": "Answer to: What is SQL?",
+            "FAIL this one": None,
+        }
+        assert not any("What is OOP?" in p for p in client.llm_client.prompts), \
+            "Checkpointed questions should be skipped"
+        assert json.loads(checkpoint.read_text(encoding="utf-8")) == {
+            "What is OOP?": "Saved answer",
+            "What is SQL?": "Answer to: What is SQL?",
+        }
+        
+        # A second run has only the failed question left to ask
+        client.llm_client.prompts.clear()
+        client.batch_answer_questions(questions, checkpoint_path=checkpoint)
+        assert len(client.llm_client.prompts) == 1
+    
+    def test_submit_batch_builds_requests(self, client, monkeypatch):
+        """Test the JSONL body sent to the Batch API."""
+        import json
+        from types import SimpleNamespace
+        import mcp.client as mcp_client
+        
+        class StubBatchAPI:
+            def __init__(self):
+                self.uploads = []
+                self.files = SimpleNamespace(create=self.create_file)
+                self.batches = SimpleNamespace(create=self.create_batch)
+            
+            def create_file(self, file, purpose):
+                self.uploads.append(file[1].decode("utf-8"))
+                return SimpleNamespace(id="file-1")
+            
+            def create_batch(self, input_file_id, endpoint, completion_window):
+                return SimpleNamespace(id="batch-1")
+        
+        api = client._batch_client = StubBatchAPI()
+        questions = ["What is OOP?", "What is SQL?", "What is OOP?"]
+        
+        # Refuses to submit until the batch server and model are configured
+        monkeypatch.setattr(mcp_client, "BATCH_API_URL", None)
+        monkeypatch.setattr(mcp_client, "BATCH_MODEL", None)
+        assert client.submit_batch(questions) is None
+        assert api.uploads == []
+        
+        monkeypatch.setattr(mcp_client, "BATCH_API_URL", "http://batch.test/v1")
+        monkeypatch.setattr(mcp_client, "BATCH_MODEL", "batch-model")
+        assert client.submit_batch(questions, mode="exam", num_predict=200) == "batch-1"
+        
+        requests = [json.loads(line) for line in api.uploads[0].splitlines()]
+        assert [r["custom_id"] for r in requests] == ["0", "1"], \
+            "Each unique question should be sent once"
+        body = requests[0]["body"]
+        assert requests[0]["url"] == "/v1/chat/completions"
+        assert body["model"] == "batch-model"
+        assert body["max_tokens"] == 200
+        assert body["temperature"] == client.temperature_map["exam"]
+        assert [m["role"] for m in body["messages"]] == ["system", "user"]
+        assert "What is OOP?" in body["messages"][1]["content"]
+
+
+class TestVLLMClient:
+    """Tests for VLLMClient request building and response parsing."""
+    
+    class StubResponse:
+        def __init__(self, status_code=200, body=None, lines=()):
+            self.status_code = status_code
+            self.body = body
+            self.lines = lines
+            self.text = "error"
+        
+        def json(self):
+            return self.body
+        
+        def iter_lines(self):
+            return iter(self.lines)
+        
+        def __enter__(self):
+            return self
+        
+        def __exit__(self, *exc):
+            return False
+    
+    class StubSession:
+        def __init__(self, response):
+            self.response = response
+            self.requests = []
+        
+        def post(self, url, json=None, timeout=None, stream=False):
+            self.requests.append((url, json))
+            return self.response
+        
+        def get(self, url, timeout=None):
+            self.requests.append((url, None))
+            return self.response
+        
+        def close(self):
+            pass
+    
+    @pytest.fixture
+    def client(self):
+        """Fixture: VLLMClient without a server."""
+        from scripts.vllm_client import VLLMClient
+        
+        return VLLMClient(base_url="http://vllm:8000", model="test-model")
+    
+    def test_query_model(self, client):
+        """Test that the system prompt is sent as a prefix and the text is returned."""
+        response = self.StubResponse(body={"choices": [{"text": "  An answer. "}]})
+        client.session = self.StubSession(response)
+        
+        answer = client.query_model("Question?", temperature=0.5, num_predict=64, system="Be brief.")
+        
+        assert answer == "An answer."
+        url, payload = client.session.requests[0]
+        assert url == "http://vllm:8000/v1/completions"
+        assert payload["model"] == "test-model"
+        assert payload["prompt"] == "Be brief.\n\nQuestion?"
+        assert payload["max_tokens"] == 64
+        assert payload["stream"] is False
+    
+    def test_query_model_error_status(self, client):
+        """Test that a non-200 response returns None."""
+        client.session = self.StubSession(self.StubResponse(status_code=500))
+        
+        assert client.query_model("Question?") is None
+    
+    def test_stream_model(self, client):
+        """Test that server-sent events are yielded as text chunks until [DONE]."""
+        lines = [
+            b'data: {"choices": [{"text": "An"}]}',
+            b"",
+            b'data: {"choices": [{"text": " answer"}]}',
+            b'data: {"choices": [{"text": ""}]}',
+            b"data: [DONE]",
+            b'data: {"choices": [{"text": "ignored"}]}',
+        ]
+        client.session = self.StubSession(self.StubResponse(lines=lines))
+        
+        assert list(client.stream_model("Question?")) == ["An", " answer"]
+        assert client.session.requests[0][1]["stream"] is True
+    
+    def test_warm_up_checks_models_endpoint(self, client):
+        """Test that warm_up() only checks the connection."""
+        client.session = self.StubSession(self.StubResponse(body={"data": [{"id": "test-model"}]}))
+        
+        assert client.warm_up() is True
+        assert client.list_models() == ["test-model"]
+        assert client.session.requests[0][0] == "http://vllm:8000/v1/models"
+    
+    def test_pooled_client_requires_check_connection(self):
+        """Test that a client without check_connection() cannot be created."""
+        from scripts.http_session import PooledHTTPClient
+        
+        class NoCheckClient(PooledHTTPClient):
+            pass
+        
+        with pytest.raises(TypeError):
+            NoCheckClient(base_url="http://llm:8000", model="test-model", timeout=5)
+
+
 if __name__ == "__main__":
     # Run tests with pytest
     pytest.main([__file__, "-v", "--tb=short"])